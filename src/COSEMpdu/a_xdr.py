@@ -9,13 +9,70 @@ _empty = asn1.NullType.__slots__
 _value = asn1._value
 
 
-def create_buf(value: asn1.Type) -> Buf:
-    buf: Buf = Buf.allocate(len(value))
+def create_buf(value: asn1.Type, pool: byte_buffer.BufferPool = None) -> Buf:
+    """with <pool> return acquired buffer, release it after use"""
+    if pool is None:
+        buf: Buf = Buf.allocate(len(value))
+        value.put(buf)
+    else:
+        buf = pool.acquire(len(value))
+        value.put(buf)
+        if (tail := buf.remaining()) != 0:
+            buf.write(bytes(tail))
+    buf.set_pos(0)
+    return buf
+
+
+def create_growable_buf(value: asn1.Type) -> byte_buffer.GrowableByteBuffer:
+    """same as create_buf without len() pre-pass of value"""
+    buf = byte_buffer.GrowableByteBuffer.allocate()
     value.put(buf)
     buf.set_pos(0)
     return buf
 
 
+class InternTable(dict):
+    """shared values of 1-octet type by octet, created by first access"""
+    __slots__ = ("type", "ids")
+
+    def __init__(self, t: type[asn1.SimpleType]):
+        super().__init__()
+        self.type = t
+        self.ids: set[int] = set()
+        """ id of shared values for check of assignment """
+
+    def __missing__(self, octet: int) -> asn1.SimpleType:
+        ret = self[octet] = self.type(bytes((octet,)))
+        return ret
+
+    def __setitem__(self, octet: int, value: asn1.SimpleType):
+        super().__setitem__(octet, value)
+        self.ids.add(id(value))
+
+
+def _set_attr_interned(self, name: str, value):
+    """reject change of value for shared instance"""
+    if name == "value" and id(self) in self.INTERNED.ids:
+        raise AttributeError(F"can't change interned {self.__class__.__name__}, create new instance")
+    object.__setattr__(self, name, value)
+
+
+class Interned(ABC):
+    """decoded values with Size 1 are shared from class table, that's why they are immutable"""
+    __slots__ = _empty
+    INTERNED: InternTable | None = None
+    """values by octet, None if Size != 1"""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.Size == 1:
+            cls.INTERNED = InternTable(cls)
+            cls.__setattr__ = _set_attr_interned
+        else:
+            cls.INTERNED = None
+            cls.__setattr__ = object.__setattr__
+
+
 class Tag(x690.ComponentEDV, asn1.Tag):
     """IEC 61334-6 2000 6.7 Tagged types"""
     def __len__(self):
@@ -59,12 +116,17 @@ class BitStringType(asn1.BitStringType):
     def __len__(self) -> int:
         return sum(map(len, self.value))
 
+    def bit_len(self) -> int:
+        return self.value[0].value
+
     @classmethod
-    def from_str(cls, value: str) -> Self:
-        """override asn.1"""
-        l = x690.Length(len(value))
-        value = value + '0' * ((8 - l.value) % 8)
-        return cls((l, bytes((int(value[count:(count + 8)], base=2) for count in range(0, l.value, 8)))))
+    def from_content(cls, n: int, content: ByteString) -> Self:
+        return cls((x690.Length(n), bytes(content)))
+
+    def _octets(self) -> tuple[bytearray, int]:
+        if not isinstance(content := self.value[1], bytearray):
+            self.value = (self.value[0], content := bytearray(content))
+        return content, 0
 
     @classmethod
     def get(cls, buf: Buf) -> Self:
@@ -74,12 +136,6 @@ class BitStringType(asn1.BitStringType):
     def put(self, buf: Buf) -> int:
         return self.value[0].put(buf) + buf.write(self.value[1])
 
-    def to_list(self) -> list[int]:
-        ret = list()
-        for byte_ in self.content:
-            ret.extend([(byte_ >> it) & 0b00000001 for it in range(7, -1, -1)])
-        return ret[:self.length.value]
-
     @property
     def length(self) -> x690.Length:
         return self.value[0]
@@ -89,7 +145,7 @@ class BitStringType(asn1.BitStringType):
         return self.value[1]
 
 
-class BooleanType(asn1.BooleanType):
+class BooleanType(Interned, asn1.BooleanType):
     __slots__ = _value
 
     def __len__(self) -> int:
@@ -97,7 +153,7 @@ class BooleanType(asn1.BooleanType):
 
     @classmethod
     def get(cls, buf: Buf) -> Self:
-        return cls(buf.read(cls.Size))
+        return cls.INTERNED[buf.get_uint8()]
 
     def put(self, buf: Buf) -> int:
         return buf.write(self.value)
@@ -107,6 +163,8 @@ FALSE = BooleanType(b'\x00')
 """allocated FALSE"""
 TRUE = BooleanType(b'\x01')
 """allocated TRUE"""
+BooleanType.INTERNED[0] = FALSE
+BooleanType.INTERNED[1] = TRUE
 
 
 class UTF8String(_StringCoder, asn1.UTF8String):
@@ -119,8 +177,23 @@ class VisibleString(_StringCoder, asn1.VisibleString):
 
 class Choice(asn1.Choice, ABC):
     ELEMENTS: asn1.AlternativeTypeList
+    TAGS: tuple[type[asn1.Type] | None, ...] = (None,) * 256
+    """alternatives by tag octet, None if unknown or not build yet"""
     __slots__ = _value
 
+    @classmethod
+    def _init_named_types(cls):
+        super()._init_named_types()
+        tags = [None] * 256
+        for tag, n_t in cls.NAMED_TYPES.items():
+            if 0 <= tag < 256:
+                tags[tag] = n_t
+        cls.TAGS = tuple(tags)
+
+    def __init_subclass__(cls, **kwargs):
+        cls.TAGS = Choice.TAGS
+        super().__init_subclass__(**kwargs)
+
     def __len__(self):
         if self.Tag.ClassNumber == asn1.UniversalClassTagAssignments.Reserved:
             return len(self.value)
@@ -129,9 +202,8 @@ class Choice(asn1.Choice, ABC):
 
     @classmethod
     def get(cls, buf: Buf) -> asn1.Type:  # todo: make more restricted annotation
-        n_t = cls.get_named_type(buf.get_uint8())
-        buf.set_pos(buf.get_pos() - 1)  # todo: make better - one more read buffer tag
-        # return cls(n_t.get(buf))
+        if (n_t := cls.TAGS[tag := buf.peek_uint8()]) is None:
+            n_t = cls.get_named_type(tag)
         return n_t.get(buf)
 
     def put(self, buf: Buf) -> int:
@@ -159,7 +231,7 @@ class NullType(asn1.NullType):
 
     @classmethod
     def get(cls, buf: Buf) -> Self:
-        return cls()
+        return cls.default()
 
     def put(self, buf: Buf) -> int:
         """not carry info"""
@@ -211,7 +283,7 @@ class SequenceType(asn1.SequenceType, ABC):
     @classmethod
     def get(cls, buf: Buf) -> Self:
         ret = list()
-        for el in cls.__annotations__.values():
+        for el in cls.FIELDS:
             el: asn1.Type
             ret.append(el.get(buf))
         return cls(tuple(ret))
@@ -247,7 +319,7 @@ def get_sequence_of(t: type[asn1.Type]) -> type[SequenceOfType]:
     return SequenceOf
 
 
-class SizedCoder(asn1.SimpleType, ABC):
+class SizedCoder(Interned, asn1.SimpleType, ABC):
     """coder for Types with Size != -1 """
     __slots__ = _empty
 
@@ -260,7 +332,10 @@ class SizedCoder(asn1.SimpleType, ABC):
 
     @classmethod
     def get(cls, buf: Buf) -> Self:
-        return cls(buf.read(cls.Size))
+        if cls.INTERNED is None:
+            return cls(buf.read(cls.Size))
+        else:
+            return cls.INTERNED[buf.get_uint8()]
 
     def put(self, buf: Buf) -> int:
         return buf.write(self.value)
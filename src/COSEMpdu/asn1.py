@@ -1,10 +1,10 @@
 """Rec. ITU-T X.680 (02/2021)"""
 from abc import ABC, abstractmethod
-from functools import lru_cache
 from inspect import getfullargspec
-from typing import Self, ByteString, TypeAlias, Literal, Any, Union, get_args
+from typing import Self, ByteString, TypeAlias, Literal, Any, Union, Callable, Iterator, get_args
 from dataclasses import dataclass
 from enum import IntEnum
+from types import MemberDescriptorType
 from .byte_buffer import ByteBuffer as Buf
 
 
@@ -150,6 +150,22 @@ class Type(ABC):
             return False
 
 
+def detach(value: Type) -> Type:
+    """replace views to decoded buffer by bytes in all tree of value, after it buffer is not kept by value. Return same value"""
+    stack: list[Type] = [value]
+    while stack:
+        match getattr(node := stack.pop(), "value", None):
+            case memoryview() as view:
+                node.value = bytes(view)
+            case Type() as el:
+                stack.append(el)
+            case tuple() as elements:
+                if any(isinstance(el, memoryview) for el in elements):
+                    node.value = tuple(bytes(el) if isinstance(el, memoryview) else el for el in elements)
+                stack.extend(el for el in elements if isinstance(el, Type))
+    return value
+
+
 class WithoutCoding(ABC):
     """for using Types without coding"""
     __slots__ = _empty
@@ -219,6 +235,64 @@ class Digital(SimpleType, ABC):
         """return signed flag"""
 
 
+def _get_value_property(slot: MemberDescriptorType) -> property:
+    """<value> stored in <slot>, assignment resets cached int"""
+    def set_value(self, value):
+        slot.__set__(self, value)
+        self._int = None
+
+    return property(slot.__get__, set_value, doc="contents, assignment resets cached int")
+
+
+class Numeric(ABC):
+    """int of value decoded once and cached in slot. Hash and comparison by it"""
+    __slots__ = ("_int",)
+
+    def __init_subclass__(cls, **kwargs):
+        """own slot of <value> is replaced by property with reset of cache"""
+        super().__init_subclass__(**kwargs)
+        if isinstance(slot := cls.__dict__.get("value"), MemberDescriptorType):
+            cls.value = _get_value_property(slot)
+
+    @abstractmethod
+    def _get_int(self) -> int:
+        """decode value to builtin int"""
+
+    def __int__(self):
+        if (ret := self._int) is None:
+            ret = self._int = self._get_int()
+        return ret
+
+    __hash__ = __int__
+
+    def _ints(self, other) -> tuple[int, int] | None:
+        """ints of self and other, None if other is not Numeric"""
+        if isinstance(other, Numeric):
+            if (a := self._int) is None:
+                a = int(self)
+            if (b := other._int) is None:
+                b = int(other)
+            return a, b
+        return None
+
+    def __eq__(self, other):
+        if (ints := self._ints(other)) is None:
+            return int(self) == int(other)
+        return ints[0] == ints[1]
+
+    def __lt__(self, other):
+        return NotImplemented if (ints := self._ints(other)) is None else ints[0] < ints[1]
+
+    def __le__(self, other):
+        return NotImplemented if (ints := self._ints(other)) is None else ints[0] <= ints[1]
+
+    def __gt__(self, other):
+        return NotImplemented if (ints := self._ints(other)) is None else ints[0] > ints[1]
+
+    def __ge__(self, other):
+        return NotImplemented if (ints := self._ints(other)) is None else ints[0] >= ints[1]
+
+
 class Sized(ABC):
     """Contract. """
     __slots__ = _empty
@@ -230,37 +304,115 @@ Unused = Literal[0, 1, 2, 3, 4, 5, 6, 7]
 
 
 class BitStringType(BuiltinType, ABC):
+    """bits by index from most significant bit of content. Bit operations by bytes of content, shifts and logic by int"""
     __slots__ = _empty
     Tag = UniversalClassTagAssignments.BitString
 
     def __init__(self, value: ByteString):
         self.value = value
 
+    @abstractmethod
+    def bit_len(self) -> int:
+        """amount of bits"""
+
+    @property
+    @abstractmethod
+    def content(self) -> ByteString:
+        """octets with bits, unused tail in last octet"""
+
+    @classmethod
+    @abstractmethod
+    def from_content(cls, n: int, content: ByteString) -> Self:
+        """constructor by amount of bits and octets with zero tail"""
+
+    @abstractmethod
+    def _octets(self) -> tuple[bytearray, int]:
+        """mutable octets of value with content from offset, for change bits in place"""
+
+    @classmethod
+    def from_int(cls, value: int, n: int) -> Self:
+        """constructor by <n> bits of int, bit 0 is most significant"""
+        if value < 0 or value >> n:
+            raise ValueError(F"for {cls.__name__} got {value=} out of {n} bits")
+        return cls.from_content(n, (value << (-n % 8)).to_bytes((n + 7) // 8, "big"))
+
+    def to_int(self) -> int:
+        """bits as int, bit 0 is most significant"""
+        return int.from_bytes(self.content, "big") >> (-self.bit_len() % 8)
+
+    @classmethod
+    def from_str(cls, value: str) -> Self:
+        return cls.from_int(int(value, 2) if value else 0, len(value))
+
     @classmethod
     def from_list(cls, value: list[int]) -> Self:
         return cls.from_str("".join(map(str, value)))
 
+    def to_list(self) -> list[int]:
+        """cast to python builtin list"""
+        return list(map(int, self.to_str()))
+
+    def to_str(self) -> str:
+        """bits as '0' and '1'"""
+        if (n := self.bit_len()) == 0:
+            return ""
+        return format(self.to_int(), F"0{n}b")
+
+    def __index(self, key: int) -> int:
+        if not -(n := self.bit_len()) <= key < n:
+            raise IndexError(F"for {self.__class__.__name__} with {n} bits got {key=}")
+        return key % n
+
+    def __getitem__(self, item: int | slice) -> int | list[int]:
+        """ get integer(0, 1) from contents by index """
+        if isinstance(item, slice):
+            return self.to_list()[item]
+        i = self.__index(item)
+        return (self.content[i >> 3] >> (7 - (i & 0b111))) & 1
+
     def __setitem__(self, key: int, value: int | bool):
-        tmp: list[int] = self.to_list()
-        tmp[key] = int(value)
-        new: Self = self.from_list(tmp)
-        self.value = new.value
+        i = self.__index(key)
+        octets, offset = self._octets()
+        if value:
+            octets[offset + (i >> 3)] |= 0x80 >> (i & 0b111)
+        else:
+            octets[offset + (i >> 3)] &= ~(0x80 >> (i & 0b111))
 
     def inverse(self, index: int):
         """ inverse one bit by index"""
-        self[index] = self.to_list()[index] ^ 0b1
+        i = self.__index(index)
+        octets, offset = self._octets()
+        octets[offset + (i >> 3)] ^= 0x80 >> (i & 0b111)
+
+    def __lshift__(self, other: int) -> Self:
+        """rotate left by <other> bits in place"""
+        if (n := self.bit_len()) != 0 and (k := other % n) != 0:
+            v = self.to_int()
+            self.value = self.from_int(((v << k) | (v >> (n - k))) & ((1 << n) - 1), n).value
+        return self
+
+    def __rshift__(self, other: int) -> Self:
+        """rotate right by <other> bits in place"""
+        return self.__lshift__(-other)
+
+    def __logic(self, other: Self, f: Callable[[int, int], int]) -> Self:
+        if (n := self.bit_len()) != other.bit_len():
+            raise ValueError(F"for {self.__class__.__name__} got different length: {n} and {other.bit_len()}")
+        return self.from_int(f(self.to_int(), other.to_int()), n)
+
+    def __and__(self, other: Self) -> Self:
+        """common bits, e.g. negotiated conformance"""
+        return self.__logic(other, int.__and__)
 
-    def __lshift__(self, other):
-        for i in range(other):
-            tmp: list[int] = self.to_list()
-            tmp.append(tmp.pop(0))
-            self.value = self.from_list(tmp)
+    def __or__(self, other: Self) -> Self:
+        return self.__logic(other, int.__or__)
 
-    def __rshift__(self, other):
-        for i in range(other):
-            tmp: list[int] = self.to_list()
-            tmp.insert(0, tmp.pop())
-            self.value = self.from_list(tmp)
+    def __xor__(self, other: Self) -> Self:
+        return self.__logic(other, int.__xor__)
+
+    def popcount(self) -> int:
+        """amount of set bits"""
+        return self.to_int().bit_count()
 
     @classmethod
     def default(cls) -> Self:
@@ -268,21 +420,11 @@ class BitStringType(BuiltinType, ABC):
         raise ValueError("not implement")
 
     def __str__(self):
-        """ TODO: copypast cdt FlagMixin"""
-        return ''.join(map(str, self.to_list()))
-
-    def __getitem__(self, item) -> int:
-        """ get integer(0, 1) from contents by index """
-        return self.to_list()[item]
-
-    @abstractmethod
-    def to_list(self) -> list[int]:
-        """cast to python builtin list"""
+        return self.to_str()
 
     def clear(self):
         """set all bits as 0"""
-        for i in range(len(self)):
-            self[i] = 0
+        self.value = self.from_int(0, self.bit_len()).value
 
 
 class BooleanType(Digital, BuiltinType, ABC):
@@ -373,7 +515,10 @@ class Choice(BuiltinType, ABC):
     """CHOICE"""
     Tag = Tag(UniversalClassTagAssignments.Reserved)
     value: Type
-    ELEMENTS: AlternativeTypeList
+    ELEMENTS: tuple[type[Type], ...] | None = None
+    """alternatives by annotation of value, build with subclass creation"""
+    NAMED_TYPES: dict[int, type[NamedType]] | None = None
+    """alternatives by tag, build with subclass creation"""
     __slots__ = _empty
 
     @abstractmethod
@@ -404,17 +549,41 @@ class Choice(BuiltinType, ABC):
 
     @classmethod
     def get_elements(cls) -> tuple[type[Type]]:
-        return get_args(cls.get_type())
+        if cls.ELEMENTS is None:
+            cls._init_named_types()
+        return cls.ELEMENTS
+
+    def __init_subclass__(cls, **kwargs):
+        """build table of alternatives with class creation"""
+        super().__init_subclass__(**kwargs)
+        try:
+            cls._init_named_types()
+        except KeyError:
+            """value annotation set after creation(see main.Data), build with first use"""
+            cls.ELEMENTS = None
+            cls.NAMED_TYPES = None
+
+    @classmethod
+    def _init_named_types(cls):
+        cls.ELEMENTS = get_args(cls.get_type())
+        named_types = dict()
+        for n_t in cls.ELEMENTS:
+            if isinstance(n_t, type):
+                named_types.setdefault(int(n_t.Tag), n_t)
+        cls.NAMED_TYPES = named_types
+
+    @classmethod
+    def get_named_types(cls) -> dict[int, type[NamedType]]:
+        """alternatives by tag"""
+        if cls.NAMED_TYPES is None:
+            cls._init_named_types()
+        return cls.NAMED_TYPES
 
     @classmethod
-    @lru_cache(maxsize=20)
     def get_named_type(cls, tag: int) -> NamedType:
-        for n_t in cls.get_elements():
-            n_t: NamedType
-            if int(n_t.Tag) == tag:
-                return n_t
-        else:
+        if (n_t := cls.get_named_types().get(tag)) is None:
             raise ValueError(F"in {cls.__name__} got unknown {tag=}, expected {', '.join(str(n_t.Tag) for n_t in cls.get_elements())}")
+        return n_t
 
     def __eq__(self, other: Self):
         if self.value.Tag == other.value.Tag and self.value == other.value:
@@ -428,7 +597,7 @@ class Choice(BuiltinType, ABC):
         return cls(cls.get_elements()[0].default())
 
 
-class IntegerType(Digital, SimpleType, BuiltinType, ABC):
+class IntegerType(Numeric, Digital, SimpleType, BuiltinType, ABC):
     """ Default value is 0 """
     Tag = Tag(UniversalClassTagAssignments.Integer)
     __slots__ = ("value",)
@@ -449,18 +618,8 @@ class IntegerType(Digital, SimpleType, BuiltinType, ABC):
     def SIGNED(cls) -> bool:
         return True
 
-    def __gt__(self, other: Self):
-        match other:
-            case IntegerType():
-                return int(self) > int(other)
-            case _:
-                raise TypeError(F'Compare type is {other.__class__}, expected {self.__class__.__name__}')
-
-    def __hash__(self):
-        return int(self)
-
-    def __eq__(self, other: Self):
-        return int(self) == int(other)
+    def _get_int(self) -> int:
+        return Digital.__int__(self)
 
 
 @dataclass
@@ -470,13 +629,13 @@ class NamedNumber:
     number: int
 
 
-class EnumeratedType(SimpleType, BuiltinType, ABC):  # todo: make common with Digital
+class EnumeratedType(Numeric, SimpleType, BuiltinType, ABC):  # todo: make common with Digital
     """Default value is 0"""
     Tag = Tag(UniversalClassTagAssignments.Enumerated)
     __slots__ = ("value",)
     ENUMERATIONS: tuple[NamedNumber]
 
-    def __int__(self):
+    def _get_int(self) -> int:
         return int.from_bytes(self.value)
 
     @classmethod
@@ -503,19 +662,6 @@ class EnumeratedType(SimpleType, BuiltinType, ABC):  # todo: make common with Di
         else:
             return str(n)
 
-    def __gt__(self, other: Self):
-        match other:
-            case EnumeratedType():
-                return int(self) > int(other)
-            case _:
-                raise TypeError(F'Compare type is {other.__class__}, expected {self.__class__.__name__}')
-
-    def __hash__(self):
-        return int(self)
-
-    def __eq__(self, other: Self):
-        return int(self) == int(other)
-
 
 class NullType(BuiltinType, ABC):
     Size = 0
@@ -579,67 +725,54 @@ class Optional(ComponentType, ABC):
 ComponentTypeList: TypeAlias = tuple[Type | ComponentType, ...]
 
 
-class AnnotationGetterMixin(ABC):
-    """use annotation for init elements"""
-    value: Any
-    @property
-    def _get0(self):
-        return self.value[0]
-
-    @property
-    def _get1(self):
-        return self.value[1]
+_ACCESSORS: list[property] = list()
+"""properties of element by index, common for all classes"""
 
-    @property
-    def _get2(self):
-        return self.value[2]
-
-    @property
-    def _get3(self):
-        return self.value[3]
 
-    @property
-    def _get4(self):
-        return self.value[4]
+def _get_accessor(i: int) -> property:
+    """return property of element <i> from value"""
+    while len(_ACCESSORS) <= i:
+        n = len(_ACCESSORS)
+        _ACCESSORS.append(property(lambda self, n=n: self.value[n], doc=F"element {n}"))
+    return _ACCESSORS[i]
 
-    @property
-    def _get5(self):
-        return self.value[5]
 
-    @property
-    def _get6(self):
-        return self.value[6]
-
-    @property
-    def _get7(self):
-        return self.value[7]
-
-    @property
-    def _get8(self):
-        return self.value[8]
-
-    @property
-    def _get9(self):
-        return self.value[9]
+class AnnotationGetterMixin(ABC):
+    """use annotation for init elements"""
+    value: Any
+    NAMES: tuple[str, ...] = ()
+    """names of elements by annotation, frozen with class creation"""
+    FIELDS: tuple[type[Type], ...] = ()
+    """types of elements by annotation, frozen with class creation"""
 
     def __init_subclass__(cls, **kwargs):
         """link attributes with functions"""
-        if len(cls.__annotations__) != 0:
-            for (name, type_), f in zip(cls.__annotations__.items(),
-                                        (cls._get0, cls._get1, cls._get2, cls._get3, cls._get4, cls._get5, cls._get6, cls._get7, cls._get8, cls._get9)):
-                setattr(cls, name, f)
+        super().__init_subclass__(**kwargs)
+        if "value" in cls.__annotations__:
+            """annotation of contents in abstract types, not element. Linking clobbers <value>"""
+            cls.NAMES, cls.FIELDS = (), ()
+        else:
+            cls.NAMES = tuple(cls.__annotations__.keys())
+            cls.FIELDS = tuple(cls.__annotations__.values())
+            for i, name in enumerate(cls.NAMES):
+                setattr(cls, name, _get_accessor(i))
+            cls.__match_args__ = cls.NAMES
+
+    def __iter__(self) -> Iterator[Type]:
+        """unpacking of elements: a, b, c = value"""
+        return iter(self.value)
 
     @classmethod
     def default(cls) -> Self:
-        return cls(tuple(el.default() for el in cls.__annotations__.values()))
+        return cls(tuple(el.default() for el in cls.FIELDS))
 
     @classmethod
     def from_str(cls, value: str) -> Self:
         values = get_values(value)
-        if len(values) == len(cls.__annotations__):
-            return cls(tuple(el.from_str(val) for el, val in zip(cls.__annotations__.values(), values)))
+        if len(values) == len(cls.FIELDS):
+            return cls(tuple(el.from_str(val) for el, val in zip(cls.FIELDS, values)))
         else:
-            raise ValueError(F"{cls} from {value=} got {len(values)} elements, expected {len(cls.__annotations__)}")
+            raise ValueError(F"{cls} from {value=} got {len(values)} elements, expected {len(cls.FIELDS)}")
 
 
 class SequenceType(AnnotationGetterMixin, BuiltinType, ABC):
@@ -653,7 +786,7 @@ class SequenceType(AnnotationGetterMixin, BuiltinType, ABC):
         self.value = value
 
     def __str__(self):
-        return F"{SequenceType.__name__}[{len(self.__annotations__)}]"
+        return F"{SequenceType.__name__}[{len(self.FIELDS)}]"
 
     @classmethod
     @abstractmethod
@@ -1,4 +1,4 @@
-from typing import Self
+from typing import Self, ByteString
 from abc import ABC
 from . import asn1, x690
 from .byte_buffer import ByteBuffer as Buf, ByteBuffer
@@ -24,23 +24,27 @@ class BitStringType(asn1.BitStringType):
     def put(self, buf: Buf) -> int:
         return self.Tag.put(buf) + x690.Length(len(self.value)).put(buf) + buf.write(self.value)
 
+    def bit_len(self) -> int:
+        return (len(self.value) - 1) * 8 - self.unused
+
     @classmethod
-    def from_str(cls, value: str) -> Self:
-        l: int = len(value)
-        unused: asn1.Unused = (8 - l) % 8
-        value = value + '0' * unused
-        return cls(unused.to_bytes(1, "big") + bytes((int(value[count:(count + 8)], base=2) for count in range(0, l, 8))))
-
-    def to_list(self) -> list[int]:
-        ret = list()
-        for byte_ in self.value[1:]:
-            ret.extend([(byte_ >> it) & 0b00000001 for it in range(7, -1, -1)])
-        return ret if self.unused == 0 else ret[:-self.unused]
+    def from_content(cls, n: int, content: ByteString) -> Self:
+        unused: asn1.Unused = -n % 8
+        return cls(bytes((unused,)) + content)
+
+    def _octets(self) -> tuple[bytearray, int]:
+        if not isinstance(self.value, bytearray):
+            self.value = bytearray(self.value)
+        return self.value, 1
 
     @property
     def unused(self) -> int:
         return self.value[0]
 
+    @property
+    def content(self) -> ByteString:
+        return self.value[1:]
+
 
 # class TaggedType(asn1.TaggedType):
 #     def put(self, buf: ByteBuffer) -> int:
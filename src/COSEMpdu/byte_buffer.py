@@ -1,12 +1,17 @@
-from typing import Self
-from struct import pack, Struct
+from typing import Self, Iterator
+from struct import Struct
 from math import log
+from contextlib import contextmanager
+from dataclasses import dataclass
 
 
 class ByteBuffer:
     buf: memoryview
     __pos: int
-    __slots__ = ("buf", "__pos")
+    __marks: list[int]
+    __slots__ = ("buf", "__pos", "__marks")
+    DETACHING: bool = False
+    """read return copy instead of view"""
 
     """Object class wrapping a byte array and allowing manipulation"""
 
@@ -38,6 +43,10 @@ class ByteBuffer:
         if self.remaining(pos) < space:
             raise BufferError(F"{self} not enough more {space=}")
 
+    def _check_write(self, space: int, pos: int):
+        """check whether this buffer has enough `space` for write op"""
+        self._check_space(space, pos)
+
     def read(self, length: int = 1) -> memoryview:
         """return view to position, increase position"""
         ret = self.read_pos(self.__pos, length)
@@ -66,13 +75,13 @@ class ByteBuffer:
         """keep data to position, return length data"""
         if not length:
             length = len(value)
-        self._check_space(length, pos)
+        self._check_write(length, pos)
         self.buf[pos: pos + length] = value
         return length
 
     def put_uint8(self, value: int) -> int:
         """put builtin int, increase position"""
-        self._check_space(1)
+        self._check_write(1, self.__pos)
         self.buf[self.__pos] = value
         self.__pos += 1
         return 1
@@ -91,6 +100,65 @@ class ByteBuffer:
         """get integer8, increase position"""
         return self.read(1)[0]
 
+    def peek_uint8(self) -> int:
+        """get integer8 without increasing position"""
+        self._check_space(1)
+        return self.buf[self.__pos]
+
+    def skip(self, length: int) -> int:
+        """increase position without reading, return old position"""
+        self._check_space(length)
+        ret = self.__pos
+        self.__pos += length
+        return ret
+
+    def ensure(self, length: int):
+        """check once <length> bytes for reading from position, inside them use unchecked reading"""
+        self._check_space(length)
+
+    def reserve(self, length: int):
+        """check once <length> bytes for writing from position, inside them use unchecked writing.
+        GrowableByteBuffer expands and counts them as written"""
+        self._check_write(length, self.__pos)
+
+    def read_unchecked(self, length: int) -> memoryview:
+        """same as read without checking, only inside region of ensure"""
+        ret = self.buf[self.__pos: (end := self.__pos + length)]
+        self.__pos = end
+        return ret
+
+    def get_uint8_unchecked(self) -> int:
+        """same as get_uint8 without checking, only inside region of ensure"""
+        ret = self.buf[self.__pos]
+        self.__pos += 1
+        return ret
+
+    def put_unchecked(self, value: memoryview | bytes) -> int:
+        """same as write without checking, only inside region of reserve"""
+        self.buf[self.__pos: (end := self.__pos + len(value))] = value
+        ret, self.__pos = end - self.__pos, end
+        return ret
+
+    def put_uint8_unchecked(self, value: int) -> int:
+        """same as put_uint8 without checking, only inside region of reserve"""
+        self.buf[self.__pos] = value
+        self.__pos += 1
+        return 1
+
+    def unpack(self, s: Struct) -> tuple:
+        """unpack values by struct from position, increase position"""
+        self._check_space(s.size)
+        ret = s.unpack_from(self.buf, self.__pos)
+        self.__pos += s.size
+        return ret
+
+    def pack(self, s: Struct, *values) -> int:
+        """pack values by struct to position, increase position"""
+        self._check_write(s.size, self.__pos)
+        s.pack_into(self.buf, self.__pos, *values)
+        self.__pos += s.size
+        return s.size
+
     def get(self) -> bytes:
         """get one byte, increase position"""
         return bytes(self.read(1))
@@ -101,6 +169,52 @@ class ByteBuffer:
     def __getitem__(self, item):
         return self.buf.__getitem__(item)
 
+    def mark(self) -> int:
+        """keep current position for reset or commit, nested marks are allowed. Return position"""
+        try:
+            self.__marks.append(self.__pos)
+        except AttributeError:
+            """first mark of buffer"""
+            self.__marks = [self.__pos]
+        return self.__pos
+
+    def reset(self) -> int:
+        """return to position of last mark and drop it, return count of rollback bytes"""
+        try:
+            pos = self.__marks.pop()
+        except (AttributeError, IndexError):
+            raise BufferError(F"{self} reset without mark") from None
+        ret, self.__pos = self.__pos - pos, pos
+        return ret
+
+    def commit(self) -> int:
+        """drop last mark, keep position, return count of bytes after mark"""
+        try:
+            return self.__pos - self.__marks.pop()
+        except (AttributeError, IndexError):
+            raise BufferError(F"{self} commit without mark") from None
+
+    def marks(self) -> int:
+        """amount of active marks"""
+        try:
+            return len(self.__marks)
+        except AttributeError:
+            return 0
+
+    @contextmanager
+    def checkpoint(self) -> Iterator[Self]:
+        """mark with commit on exit, reset by exception. Mark dropped inside by reset or commit is not dropped again"""
+        depth = self.marks()
+        self.mark()
+        try:
+            yield self
+        except BaseException:
+            if self.marks() > depth:
+                self.reset()
+            raise
+        if self.marks() > depth:
+            self.commit()
+
     def slice(self) -> Self:
         """slice the buffer at current position. return new class"""
         return self.__class__(self.buf[self.__pos:])
@@ -131,3 +245,211 @@ class ByteBuffer:
         """shift and return old position"""
         self.set_pos((ret := self.get_pos()) + value)
         return ret
+
+
+class DetachingByteBuffer(ByteBuffer):
+    """ByteBuffer for long-lived decoded values: read return copy instead of view, values not keep buffer"""
+    __slots__ = ()
+    DETACHING = True
+
+    def read_pos(self,
+                 pos: int,
+                 length: int = 1) -> bytes:
+        """return copy from position"""
+        return bytes(super().read_pos(pos, length))
+
+    def read_unchecked(self, length: int) -> bytes:
+        """return copy without checking"""
+        return bytes(super().read_unchecked(length))
+
+
+class GrowableByteBuffer(ByteBuffer):
+    """ByteBuffer expanding with writing(amortized doubling). Length is size of written data"""
+    __size: int
+    __slots__ = ("__size",)
+
+    def __init__(self, buffer: memoryview):
+        super().__init__(buffer)
+        self.__size = 0
+        """ length of written data """
+
+    @classmethod
+    def allocate(cls, size: int = 64) -> Self:
+        """return instance with initial capacity"""
+        return cls(memoryview(bytearray(size)))
+
+    def _check_write(self, space: int, pos: int):
+        """expand instead of BufferError"""
+        if (end := pos + space) > len(self.buf):
+            new = bytearray(max(end, 2 * len(self.buf)))
+            new[:self.__size] = self.buf[:self.__size]
+            self.buf = memoryview(new)
+        if end > self.__size:
+            self.__size = end
+
+    def remaining(self, pos: int = None) -> int:
+        """remaining written bytes"""
+        if pos is None:
+            pos = self.get_pos()
+        return self.__size - pos
+
+    def capacity(self) -> int:
+        return len(self.buf)
+
+    def getbuffer(self) -> memoryview:
+        """view of written data without copy"""
+        return self.buf[:self.__size]
+
+    def __bytes__(self, length=0):
+        return bytes(self.getbuffer())
+
+    def __getitem__(self, item):
+        return self.getbuffer().__getitem__(item)
+
+    def __len__(self):
+        return self.__size
+
+    def slice(self) -> ByteBuffer:
+        """slice the written data at current position"""
+        return ByteBuffer(self.getbuffer()[self.get_pos():])
+
+    def frozen(self) -> ByteBuffer:
+        """return instance with not writable written data"""
+        return ByteBuffer(memoryview(bytes(self)))
+
+
+class ScatterGatherBuffer:
+    """encode target: headers and small contents are kept, big contents are referenced by views without copy.
+    Length is length of encoding. Result by segments, e.g. for socket.sendmsg"""
+    threshold: int
+    __slots__ = ("threshold", "__data", "__holes", "__extra")
+
+    def __init__(self, threshold: int = 1024):
+        self.threshold = threshold
+        """ minimal length of referenced contents """
+        self.__data = bytearray()
+        """ kept headers and small contents """
+        self.__holes: list[tuple[int, memoryview]] = list()
+        """ referenced contents with position in kept data """
+        self.__extra = 0
+        """ length of referenced contents """
+
+    def append(self, value: int):
+        self.__data.append(value)
+
+    def __iadd__(self, value: bytes | bytearray | memoryview) -> Self:
+        if len(value) < self.threshold:
+            self.__data += value
+        else:
+            self.__holes.append((len(self.__data), memoryview(value)))
+            self.__extra += len(value)
+        return self
+
+    def __len__(self):
+        return len(self.__data) + self.__extra
+
+    def __setitem__(self, key: slice, value: bytes | bytearray | memoryview):
+        """insert by position of encoding only: out[start:start] = ..., position is not inside referenced contents"""
+        if not isinstance(key, slice) or key.start is None or key.start != key.stop or not 0 <= key.start <= len(self):
+            raise ValueError(F"{self.__class__.__name__} support only insert, got {key}")
+        shift = 0
+        for i, (pos, view) in enumerate(self.__holes):
+            if key.start <= pos + shift:
+                break
+            if key.start < pos + shift + len(view):
+                raise ValueError(F"insert position {key.start} is inside referenced contents")
+            shift += len(view)
+        else:
+            i = len(self.__holes)
+        pos = key.start - shift
+        self.__data[pos:pos] = value
+        self.__holes[i:] = [(p + len(value), v) for p, v in self.__holes[i:]]
+
+    def segments(self) -> list[memoryview]:
+        """views of encoding in order, after it kept data is not resizable while views exist"""
+        data = memoryview(self.__data)
+        ret = list()
+        start = 0
+        for pos, view in self.__holes:
+            if pos != start:
+                ret.append(data[start:pos])
+            ret.append(view)
+            start = pos
+        if start != len(data):
+            ret.append(data[start:])
+        return ret
+
+
+@dataclass
+class PoolStatistic:
+    hits: int = 0
+    """acquire with reused buffer"""
+    misses: int = 0
+    """acquire with allocating new buffer"""
+    in_use: int = 0
+    """acquired and not released buffers"""
+    high_water: int = 0
+    """maximum of in_use"""
+
+
+class BufferPool:
+    """reusable ByteBuffers by size class(power of 2). Decoded values keep views to buffer, release it after using values"""
+    min_size: int
+    max_size: int
+    max_free: int
+    statistic: PoolStatistic
+
+    def __init__(self,
+                 min_size: int = 64,
+                 max_size: int = 0x1_00_00,
+                 max_free: int = 16):
+        self.min_size = min_size
+        """ smallest size class """
+        self.max_size = max_size
+        """ bigger sizes are not pooled """
+        self.max_free = max_free
+        """ limit of free buffers for each size class """
+        self.statistic = PoolStatistic()
+        self.__free: dict[int, list[bytearray]] = dict()
+        self.__in_use: dict[int, bytearray] = dict()
+
+    def size_class(self, size: int) -> int:
+        """capacity of pooled buffer for <size>"""
+        return max(self.min_size, 1 << (size - 1).bit_length())
+
+    def acquire(self, size: int) -> ByteBuffer:
+        """return buffer with length <size>, contents is not cleared"""
+        if size > self.max_size:
+            self.statistic.misses += 1
+            return ByteBuffer.allocate(size)
+        if free := self.__free.get(class_ := self.size_class(size)):
+            self.statistic.hits += 1
+            data = free.pop()
+        else:
+            self.statistic.misses += 1
+            data = bytearray(class_)
+        self.__in_use[id(data)] = data
+        self.statistic.in_use += 1
+        if self.statistic.in_use > self.statistic.high_water:
+            self.statistic.high_water = self.statistic.in_use
+        return ByteBuffer(memoryview(data)[:size])
+
+    def release(self, buf: ByteBuffer):
+        """return buffer to pool, <buf> is not usable after it"""
+        if len(buf.buf) > self.max_size:
+            return
+        if (data := self.__in_use.pop(id(buf.buf.obj), None)) is None:
+            raise ValueError(F"{buf} is not acquired from pool")
+        buf.buf = memoryview(b'')
+        self.statistic.in_use -= 1
+        if len(free := self.__free.setdefault(len(data), list())) < self.max_free:
+            free.append(data)
+
+    @contextmanager
+    def buffer(self, size: int) -> Iterator[ByteBuffer]:
+        """acquire with release on exit"""
+        buf = self.acquire(size)
+        try:
+            yield buf
+        finally:
+            self.release(buf)
@@ -0,0 +1,424 @@
+"""schema compiler: generate flat decode/encode functions from the a_xdr type tree"""
+from typing import Callable
+from math import log
+from . import asn1, a_xdr, ber, main
+from .byte_buffer import ByteBuffer as Buf, ScatterGatherBuffer
+
+Decoder = Callable[[Buf], asn1.Type]
+Encoder = Callable[[asn1.Type, bytearray], None]
+
+
+def _get_length(buf: Buf, define_length: int) -> int:
+    """long form of x690.Length.get, first octet already read"""
+    define_length &= 0b0_1111111
+    if define_length == 0b0_1111111:
+        return -1
+    return buf.get_uint(define_length)
+
+
+def _wrong_tag(cls: type[a_xdr.Implicit], tag: int):
+    raise ValueError(F"got {a_xdr.Tag(tag)}, expected: {cls.Tag}")
+
+
+def get_chain(cls: type, method: str = "get") -> list[type]:
+    """classes of MRO with own <method>, in order of super() calls"""
+    return [k for k in cls.__mro__ if method in k.__dict__]
+
+
+_INLINE = (a_xdr.SizedCoder, a_xdr.BooleanType, a_xdr.NullType, a_xdr.SequenceType)
+"""<get> decoding without conditions"""
+
+
+def _get_fixed(cls: type[asn1.Type]) -> tuple[int, int] | None:
+    """length of encoding and amount of read calls for inline decoding with constant length, else None"""
+    match get_chain(cls)[0]:
+        case a_xdr.SizedCoder | a_xdr.BooleanType:
+            return cls.Size, 1
+        case a_xdr.NullType:
+            return 0, 0
+        case a_xdr.SequenceType:
+            size = reads = 0
+            for el in cls.FIELDS:
+                if (fixed := _get_fixed(el)) is None:
+                    return None
+                size, reads = size + fixed[0], reads + fixed[1]
+            return size, reads
+        case _:
+            return None
+
+
+def _get_prefix(cls: type[asn1.Type]) -> tuple[int, int, int]:
+    """amount of leading elements with constant length, their length and amount of read calls"""
+    n = size = reads = 0
+    for el in cls.FIELDS:
+        if (fixed := _get_fixed(el)) is None:
+            break
+        n, size, reads = n + 1, size + fixed[0], reads + fixed[1]
+    return n, size, reads
+
+
+class _DecoderCompiler:
+    """keep generated code in common namespace, so decoders can call each other"""
+    ns: dict[str, object]
+    full: dict[type, str]
+    body: dict[type, str]
+    decoders: dict[type, Decoder]
+    source: list[str]
+
+    def __init__(self):
+        self.ns = {
+            "_get_length": _get_length,
+            "_wrong_tag": _wrong_tag}
+        self.full = dict()
+        self.body = dict()
+        self.decoders = dict()
+        self.source = list()
+        self.__refs: dict[int, str] = dict()
+        self.__pending: list[tuple[str, type, bool]] = list()
+        self.__tables: list[tuple[list, int, str]] = list()
+
+    def ref(self, obj: object) -> str:
+        """name of object in namespace"""
+        if (name := self.__refs.get(id(obj))) is None:
+            name = self.__refs[id(obj)] = F"_o{len(self.__refs)}"
+            self.ns[name] = obj
+        return name
+
+    def full_name(self, cls: type[asn1.Type]) -> str:
+        """name of decoder with reading Tag"""
+        if (name := self.full.get(cls)) is None:
+            name = self.full[cls] = F"_d{len(self.full)}_{cls.__name__}"
+            self.__pending.append((name, cls, False))
+        return name
+
+    def body_name(self, cls: type[asn1.Type]) -> str:
+        """name of decoder after Implicit Tag"""
+        if (name := self.body.get(cls)) is None:
+            name = self.body[cls] = F"_b{len(self.body)}_{cls.__name__}"
+            self.__pending.append((name, cls, True))
+        return name
+
+    def expr(self, cls: type[asn1.Type], unchecked: bool = False) -> str:
+        """inline expression of decoding if possible, else call of decoder.
+        <unchecked> for constant length inside region of buf.ensure"""
+        if (kind := get_chain(cls)[0]) in _INLINE:
+            return self.inline(cls, kind, unchecked)
+        else:
+            return F"{self.full_name(cls)}(buf)"
+
+    def inline(self, cls: type[asn1.Type], kind: type, unchecked: bool = False) -> str:
+        """expression of decoding by <get> of <kind> without conditions"""
+        if kind is a_xdr.NullType:
+            return F"{self.ref(cls)}.default()"
+        elif kind is a_xdr.SequenceType:
+            return F"{self.ref(cls)}(({self.fields(cls, len(cls.FIELDS) if unchecked else 0)}))"
+        elif cls.INTERNED is not None:
+            return F"{self.ref(cls.INTERNED)}[buf.get_uint8{'_unchecked' if unchecked else ''}()]"
+        else:
+            return F"{self.ref(cls)}({'read_u' if unchecked else 'read'}({cls.Size}))"
+
+    def fields(self, cls: type[asn1.Type], unchecked: int = 0) -> str:
+        """tuple items of annotated elements, first <unchecked> of them inside region of buf.ensure"""
+        return "".join(F"{self.expr(el, i < unchecked)}, " for i, el in enumerate(cls.FIELDS))
+
+    @staticmethod
+    def ensure(size: int, reads: int) -> list[str]:
+        """one check of bounds instead of <reads> checks, if it's profitable"""
+        return [F"buf.ensure({size})"] if reads > 1 else []
+
+    def statements(self, cls: type[asn1.Type], chain: list[type], i: int) -> list[str]:
+        """decode lines, starting from <get> of chain[i]"""
+        t = self.ref(cls)
+        match chain[i]:
+            case a_xdr.Implicit:
+                return [
+                    "tag = buf.get_uint8()",
+                    F"if tag != {cls.Tag.ClassNumber}:",
+                    F"    _wrong_tag({t}, tag)",
+                    *self.statements(cls, chain, i + 1)]
+            case a_xdr.Optional:
+                return [
+                    "if buf.get_uint8() == 0:",
+                    F"    return {t}(b'')",
+                    *self.statements(cls, chain, i + 1)]
+            case a_xdr.Choice:
+                table = [None] * 256
+                for tag, n_t in cls.get_named_types().items():
+                    if not 0 <= tag < 256:
+                        continue
+                    elif get_chain(n_t)[0] is a_xdr.Implicit:
+                        name = self.body_name(n_t)
+                    else:
+                        name = self.rewind_name(n_t)
+                    table[tag] = name
+                    self.__tables.append((table, tag, name))
+                return [
+                    "tag = buf.get_uint8()",
+                    F"if (f := {self.ref(table)}[tag]) is None:",
+                    F"    {t}.get_named_type(tag)",
+                    "return f(buf)"]
+            case main.AnnotationSequenceOfData if len(cls.FIELDS) == 0:
+                return self.statements(cls, chain, i + 1)
+            case main.AnnotationSequenceOfData:
+                n, size, reads = _get_prefix(cls)
+                return [
+                    *self.length(),
+                    F"if n != {len(cls.FIELDS)}:",
+                    F"    raise ValueError(F\"got {cls.__name__} length={{n}}, expected {len(cls.FIELDS)}\")",
+                    *self.ensure(size, reads),
+                    F"return {t}(({self.fields(cls, n if reads > 1 else 0)}))"]
+            case a_xdr.SequenceOfType if (fixed := _get_fixed(cls.Type)) is not None and fixed[0] > 0:
+                return [
+                    *self.length(),
+                    F"buf.ensure(n * {fixed[0]})",
+                    F"return {t}(tuple([{self.expr(cls.Type, True)} for _ in range(n)]))"]
+            case a_xdr.SequenceOfType:
+                return [
+                    *self.length(),
+                    F"return {t}(tuple([{self.expr(cls.Type)} for _ in range(n)]))"]
+            case a_xdr.SequenceType if (prefix := _get_prefix(cls))[2] > 1:
+                n, size, reads = prefix
+                return [
+                    *self.ensure(size, reads),
+                    F"return {t}(({self.fields(cls, n)}))"]
+            case kind if kind in _INLINE:
+                return [F"return {self.inline(cls, kind)}"]
+            case a_xdr._StringCoder:
+                return [
+                    *self.length(),
+                    F"return {t}(read(n))"]
+            case _:
+                return [F"return {self.ref(chain[i].__dict__['get'].__func__)}({t}, buf)"]
+
+    @staticmethod
+    def length() -> list[str]:
+        """x690.Length to <n>"""
+        return [
+            "n = buf.get_uint8()",
+            "if n & 0b1000_0000:",
+            "    n = _get_length(buf, n)"]
+
+    def rewind_name(self, cls: type[asn1.Type]) -> str:
+        """name of decoder for Choice element without Implicit Tag"""
+        name = F"_r_{self.full_name(cls)}"
+        if name not in self.ns:
+            self.ns[name] = None
+            self.emit(name, [
+                "buf.set_pos(buf.get_pos() - 1)",
+                F"return {self.full_name(cls)}(buf)"])
+        return name
+
+    def emit(self, name: str, lines: list[str]):
+        if any("read(" in line for line in lines):
+            lines.insert(0, "read = buf.read")
+        if any("read_u(" in line for line in lines):
+            lines.insert(0, "read_u = buf.read_unchecked")
+        self.source.append("\n    ".join((F"def {name}(buf):", *lines)))
+
+    def compile(self, cls: type[asn1.Type]) -> Decoder:
+        start = len(self.source)
+        name = self.full_name(cls)
+        while self.__pending:
+            name_, cls_, is_body = self.__pending.pop()
+            chain = get_chain(cls_)
+            self.emit(name_, self.statements(cls_, chain, int(is_body)))
+        if start != len(self.source):
+            exec("\n\n".join(self.source[start:]), self.ns)
+            while self.__tables:
+                table, tag, name_ = self.__tables.pop()
+                table[tag] = self.ns[name_]
+        self.decoders[cls] = ret = self.ns[name]
+        return ret
+
+
+_compiler = _DecoderCompiler()
+
+
+def compile_decoder(cls: type[asn1.Type]) -> Decoder:
+    """return flat decoder of <cls>, result is equal <cls>.get(buf)"""
+    return _compiler.compile(cls)
+
+
+def decode(cls: type[asn1.Type], buf: Buf) -> asn1.Type:
+    """decode by compiled decoder, compile with first use"""
+    if (f := _compiler.decoders.get(cls)) is None:
+        f = _compiler.compile(cls)
+    return f(buf)
+
+
+def _put_length(value: int) -> bytes:
+    """encoding of x690.Length(value)"""
+    if value < 0x80:
+        return bytes((value,))
+    elif value < 0x1_00:
+        return bytes((0x81, value))
+    elif value < 0x1_00_00:
+        return bytes((0x82,)) + value.to_bytes(2, "big")
+    elif value < 0x1_00_00_00_00:
+        return bytes((0x84,)) + value.to_bytes(4, "big")
+    else:
+        amount = int(log(value, 256)) + 1
+        return bytes((0x80 + amount,)) + value.to_bytes(amount, "big")
+
+
+class _EncoderCompiler:
+    """generate one-pass encoders writing to growable bytearray"""
+    ns: dict[str, object]
+    names: dict[type, str]
+    encoders: dict[type, Encoder]
+    source: list[str]
+
+    def __init__(self):
+        self.ns = {
+            "_put_length": _put_length,
+            "_encode": self.encode}
+        self.names = dict()
+        self.encoders = dict()
+        self.source = list()
+        self.__refs: dict[int, str] = dict()
+        self.__pending: list[tuple[str, type]] = list()
+
+    def ref(self, obj: object) -> str:
+        """name of object in namespace"""
+        if (name := self.__refs.get(id(obj))) is None:
+            name = self.__refs[id(obj)] = F"_o{len(self.__refs)}"
+            self.ns[name] = obj
+        return name
+
+    def name(self, cls: type[asn1.Type]) -> str:
+        if (name := self.names.get(cls)) is None:
+            name = self.names[cls] = F"_e{len(self.names)}_{cls.__name__}"
+            self.__pending.append((name, cls))
+        return name
+
+    def encode(self, value: asn1.Type, out: bytearray):
+        """encode with runtime type of <value>"""
+        if (f := self.encoders.get(value.__class__)) is None:
+            f = self.compile(value.__class__)
+        f(value, out)
+
+    def element(self, cls: type[asn1.Type], v: str) -> list[str]:
+        """lines of encoding <v>, inline for expected <cls>, else by runtime type"""
+        if (kind := get_chain(cls, "put")[0]) in _LEAF_PUT:
+            return [
+                F"if {v}.__class__ is {self.ref(cls)}:",
+                *(F"    {line}" for line in self.statements(cls, [kind], 0, v)),
+                "else:",
+                F"    _encode({v}, out)"]
+        else:
+            return [F"({self.name(cls)} if {v}.__class__ is {self.ref(cls)} else _encode)({v}, out)"]
+
+    def statements(self, cls: type[asn1.Type], chain: list[type], i: int, v: str = "value") -> list[str]:
+        """encode lines, starting from <put> of chain[i]"""
+        match chain[i]:
+            case a_xdr.Implicit:
+                return [
+                    F"out.append({cls.Tag.ClassNumber})",
+                    *self.statements(cls, chain, i + 1, v)]
+            case a_xdr.Optional:
+                return [
+                    F"if {v}.value == b'':",
+                    "    out.append(0)",
+                    "    return",
+                    "out.append(1)",
+                    *self.statements(cls, chain, i + 1, v)]
+            case a_xdr.Choice:
+                return [F"_encode({v}.value, out)"]
+            case a_xdr.SequenceType:
+                ret = [F"items = {v}.value"]
+                for n, el in enumerate(cls.FIELDS):
+                    ret.append(F"v{n} = items[{n}]")
+                    ret.extend(self.element(el, F"v{n}"))
+                return ret
+            case a_xdr.SequenceOfType:
+                return [
+                    F"items = {v}.value",
+                    *self.length("len(items)"),
+                    "for v in items:",
+                    *(F"    {line}" for line in self.element(cls.Type, "v"))]
+            case a_xdr.SizedCoder | a_xdr.BooleanType:
+                return [F"out += {v}.value"]
+            case a_xdr.NullType:
+                return ["pass"]
+            case a_xdr._StringCoder:
+                return [
+                    *self.length(F"len({v}.value)"),
+                    F"out += {v}.value"]
+            case a_xdr.BitStringType:
+                return [
+                    *self.length(F"{v}.value[0].value"),
+                    F"out += {v}.value[1]"]
+            case ber.BitStringType:
+                tag = Buf.allocate(len(cls.Tag))
+                cls.Tag.put(tag)
+                return [
+                    F"out += {bytes(tag)!r}",
+                    *self.length(F"len({v}.value)"),
+                    F"out += {v}.value"]
+            case a_xdr.EXPLICIT:
+                return [
+                    F"out.append({cls.Tag.ClassNumber})",
+                    "start = len(out)",
+                    F"_encode({v}.value, out)",
+                    "out[start:start] = _put_length(len(out) - start)"]
+            case _:
+                return [
+                    F"buf = {self.ref(Buf)}.allocate(len({v}))",
+                    F"{self.ref(chain[i].__dict__['put'])}({v}, buf)",
+                    "out += buf.buf[:buf.get_pos()]"]
+
+    @staticmethod
+    def length(value: str) -> list[str]:
+        """x690.Length of <value>"""
+        return [
+            F"if (n := {value}) < 0x80:",
+            "    out.append(n)",
+            "else:",
+            "    out += _put_length(n)"]
+
+    def compile(self, cls: type[asn1.Type]) -> Encoder:
+        start = len(self.source)
+        name = self.name(cls)
+        while self.__pending:
+            name_, cls_ = self.__pending.pop()
+            lines = self.statements(cls_, get_chain(cls_, "put"), 0)
+            self.source.append("\n    ".join((F"def {name_}(value, out):", *lines)) + "\n")
+        if start != len(self.source):
+            exec("\n\n".join(self.source[start:]), self.ns)
+        self.encoders[cls] = ret = self.ns[name]
+        return ret
+
+
+_LEAF_PUT = (a_xdr.SizedCoder, a_xdr.BooleanType, a_xdr.NullType, a_xdr._StringCoder)
+"""<put> of simple types, inlined into parent encoder"""
+
+_encoder = _EncoderCompiler()
+
+
+def compile_encoder(cls: type[asn1.Type]) -> Encoder:
+    """return one-pass encoder of <cls> instances, appending to bytearray"""
+    return _encoder.compile(cls)
+
+
+def encode(value: asn1.Type, out: bytearray = None) -> bytearray:
+    """encode <value> by compiled encoders without length pre-pass"""
+    if out is None:
+        out = bytearray()
+    _encoder.encode(value, out)
+    return out
+
+
+def encode_segments(value: asn1.Type, threshold: int = 1024) -> list[memoryview]:
+    """encode <value> with reference to contents from <threshold> length instead of copy"""
+    _encoder.encode(value, out := ScatterGatherBuffer(threshold))
+    return out.segments()
+
+
+def create_buf(value: asn1.Type) -> Buf:
+    """same as a_xdr.create_buf, with one traversal of <value>"""
+    return Buf(memoryview(encode(value)))
+
+
+def get_source() -> str:
+    """python code of all generated decoders and encoders"""
+    return "\n\n".join(_compiler.source + _encoder.source)
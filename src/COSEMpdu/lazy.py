@@ -0,0 +1,82 @@
+"""lazy decoding of Data: elements are decoded by access"""
+from typing import Self, Iterator
+from . import main, x690
+from .byte_buffer import ByteBuffer as Buf
+
+
+class LazyData:
+    """view to encoded Data with offsets of elements. Decode elements by access"""
+    type: type[main.CDT]
+    __slots__ = ("type", "__buf", "__pos", "__offsets", "__len")
+
+    def __init__(self, view: memoryview, pos: int = 0):
+        if (n_t := main.Data.TAGS[view[pos]]) is None:
+            n_t = main.Data.get_named_type(view[pos])
+        self.type = n_t
+        """ type of element """
+        self.__buf = Buf(view)
+        """ own buffer with source memory """
+        self.__pos = pos
+        """ position of element in buffer """
+        if issubclass(n_t, main.SequenceOfData):
+            self.__buf.set_pos(pos + 1)
+            self.__len = x690.Length.get(self.__buf).value
+            self.__offsets = [self.__buf.get_pos()]
+            """ known start positions of elements """
+        else:
+            self.__len = -1
+            self.__offsets = None
+
+    @classmethod
+    def get(cls, buf: Buf) -> Self:
+        """same as Data.get, without decoding"""
+        ret = cls(buf.buf, buf.get_pos())
+        buf.skip(main.get_Data_length(buf))
+        return ret
+
+    @property
+    def end(self) -> int:
+        """end position of element in buffer"""
+        if self.__len == -1:
+            return self.__pos + main.get_Data_length(self.__buf, self.__pos)
+        else:
+            return self.__offset(self.__len)
+
+    def __offset(self, index: int) -> int:
+        offsets = self.__offsets
+        while len(offsets) <= index:
+            offsets.append(offsets[-1] + main.get_Data_length(self.__buf, offsets[-1]))
+        return offsets[index]
+
+    def __len__(self) -> int:
+        if self.__len == -1:
+            raise TypeError(F"{self.type.__name__} has no elements")
+        return self.__len
+
+    def __getitem__(self, item: int) -> Self | main.CDT:
+        """return view for Array and Structure, decoded element for other"""
+        if not -len(self) <= item < self.__len:
+            raise IndexError(F"for {self} got out of range {item=}")
+        pos = self.__offset(item % self.__len)
+        if (n_t := main.Data.TAGS[self.__buf.buf[pos]]) is None:
+            n_t = main.Data.get_named_type(self.__buf.buf[pos])
+        if issubclass(n_t, main.SequenceOfData):
+            return self.__class__(self.__buf.buf, pos)
+        else:
+            self.__buf.set_pos(pos)
+            return main.Data.get(self.__buf)
+
+    def __iter__(self) -> Iterator[Self | main.CDT]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def materialize(self) -> main.CDT:
+        """decode of all tree, same as Data.get"""
+        self.__buf.set_pos(self.__pos)
+        return main.Data.get(self.__buf)
+
+    def __str__(self):
+        if self.__len == -1:
+            return F"Lazy{self.type.__name__}"
+        else:
+            return F"Lazy{self.type.__name__}[{self.__len}]"
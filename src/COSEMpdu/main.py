@@ -1,13 +1,68 @@
-from typing import Self, Union, TypeAlias
-from . import asn1, a_xdr, ber, x690
+from abc import ABC
+from typing import Self, Union, TypeAlias, Sequence, Callable
+from array import array
+from functools import lru_cache
+from struct import Struct, error as StructError
+from . import asn1, a_xdr, ber, x690, byte_buffer
 from .byte_buffer import ByteBuffer as Buf
 
 _value = a_xdr._value
+_empty = a_xdr._empty
 
 
-class Integer8(a_xdr.SizedCoder, asn1.IntegerType):
+class FixedInteger(a_xdr.SizedCoder, asn1.IntegerType, ABC):
+    """INTEGER with fixed Size, coding by precompiled STRUCT"""
+    STRUCT: Struct
+    """big-endian struct of one value"""
+    __slots__ = _empty
+
+    def _get_int(self) -> int:
+        try:
+            return self.STRUCT.unpack(self.value)[0]
+        except StructError:
+            self.validate()
+            raise
+
+    @classmethod
+    def from_int(cls, value: int) -> Self:
+        try:
+            ret = cls(cls.STRUCT.pack(value))
+        except StructError:
+            raise OverflowError(F"{cls.__name__} got out of range {value=}") from None
+        ret._int = value
+        return ret
+
+    @classmethod
+    def get_int(cls, buf: Buf) -> int:
+        """decode builtin int without object, increase position"""
+        return buf.unpack(cls.STRUCT)[0]
+
+    @classmethod
+    def put_int(cls, buf: Buf, value: int) -> int:
+        """encode builtin int without object, increase position"""
+        return buf.pack(cls.STRUCT, value)
+
+    @classmethod
+    def get_ints(cls, buf: Buf, n: int) -> tuple[int, ...]:
+        """decode <n> consecutive values by one call, increase position"""
+        return buf.unpack(_get_batch_struct(cls.STRUCT.format, n))
+
+    @classmethod
+    def put_ints(cls, buf: Buf, values: Sequence[int]) -> int:
+        """encode consecutive values by one call, increase position"""
+        return buf.pack(_get_batch_struct(cls.STRUCT.format, len(values)), *values)
+
+
+@lru_cache(maxsize=128)
+def _get_batch_struct(format_: str, n: int) -> Struct:
+    """struct of <n> values by format of one"""
+    return Struct(F">{n}{format_[-1]}")
+
+
+class Integer8(FixedInteger):
     """ INTEGER(-127…128) """
     Size = 1
+    STRUCT = Struct(">b")
     __slots__ = _value
 
     @classmethod
@@ -15,9 +70,10 @@ class Integer8(a_xdr.SizedCoder, asn1.IntegerType):
         return True
 
 
-class Integer16(a_xdr.SizedCoder, asn1.IntegerType):
+class Integer16(FixedInteger):
     """ INTEGER(-32 768...32 767) """
     Size = 2
+    STRUCT = Struct(">h")
     __slots__ = _value
 
     @classmethod
@@ -25,9 +81,10 @@ class Integer16(a_xdr.SizedCoder, asn1.IntegerType):
         return True
 
 
-class Integer32(a_xdr.SizedCoder, asn1.IntegerType):
+class Integer32(FixedInteger):
     """ INTEGER(-2 147 483 648...2 147 483 647) """
     Size = 4
+    STRUCT = Struct(">i")
     __slots__ = _value
 
     @classmethod
@@ -35,9 +92,10 @@ class Integer32(a_xdr.SizedCoder, asn1.IntegerType):
         return True
 
 
-class Integer64(a_xdr.SizedCoder, asn1.IntegerType):
+class Integer64(FixedInteger):
     """ INTEGER(-2^63...2^63-1) """
     Size = 8
+    STRUCT = Struct(">q")
     __slots__ = _value
 
     @classmethod
@@ -45,9 +103,10 @@ class Integer64(a_xdr.SizedCoder, asn1.IntegerType):
         return True
 
 
-class Unsigned8(a_xdr.SizedCoder, asn1.IntegerType):
+class Unsigned8(FixedInteger):
     """ INTEGER(0...255) """
     Size = 1
+    STRUCT = Struct(">B")
     __slots__ = _value
 
     @classmethod
@@ -55,9 +114,10 @@ class Unsigned8(a_xdr.SizedCoder, asn1.IntegerType):
         return False
 
 
-class Unsigned16(a_xdr.SizedCoder, asn1.IntegerType):
+class Unsigned16(FixedInteger):
     """ INTEGER(0...65 535) """
     Size = 2
+    STRUCT = Struct(">H")
     __slots__ = _value
 
     @classmethod
@@ -65,9 +125,10 @@ class Unsigned16(a_xdr.SizedCoder, asn1.IntegerType):
         return False
 
 
-class Unsigned32(a_xdr.SizedCoder, asn1.IntegerType):
+class Unsigned32(FixedInteger):
     """ INTEGER(0...4 294 967 295) """
     Size = 4
+    STRUCT = Struct(">I")
     __slots__ = _value
 
     @classmethod
@@ -75,9 +136,10 @@ class Unsigned32(a_xdr.SizedCoder, asn1.IntegerType):
         return False
 
 
-class Unsigned64(a_xdr.SizedCoder, asn1.IntegerType):
+class Unsigned64(FixedInteger):
     """ INTEGER(0...264-1) """
     Size = 8
+    STRUCT = Struct(">Q")
     __slots__ = _value
 
     @classmethod
@@ -211,6 +273,120 @@ class DontCare(a_xdr.Implicit, asn1.NamedType, a_xdr.NullType):
     Tag = a_xdr.Tag(255)
 
 
+class TypeDescription(a_xdr.Choice):
+    """TypeDescription"""
+    def __init__(self, value):
+        """reinit after for typing value"""
+
+
+class ArrayDescription(a_xdr.SequenceType):
+    """array of TypeDescription"""
+    __slots__ = _value
+    number_of_elements: Unsigned16
+    type_description:   TypeDescription
+
+    def __init__(self, value: tuple[Unsigned16, TypeDescription]):
+        super().__init__(value)
+
+    @classmethod
+    def from_elements(cls,
+                      number_of_elements: Unsigned16,
+                      type_description:   TypeDescription):
+        return cls((number_of_elements, type_description))
+
+
+class arrayDescription(a_xdr.Implicit, asn1.NamedType, ArrayDescription):
+    Tag = a_xdr.Tag(1)
+    __annotations__ = ArrayDescription.__annotations__
+
+
+class SequenceOfTypeDescription(a_xdr.SequenceOfType):
+    Type = TypeDescription
+
+    def __init__(self, value: tuple[TypeDescription, ...]):
+        super().__init__(value)
+
+
+class structureDescription(a_xdr.Implicit, asn1.NamedType, SequenceOfTypeDescription):
+    Tag = a_xdr.Tag(2)
+
+
+def get_simple_description(t: type[asn1.NamedType]) -> type[a_xdr.Implicit]:
+    """return TypeDescription of simple Data alternative"""
+    class SimpleDescription(asn1.NamedType, a_xdr.Implicit, a_xdr.NullType):
+        Tag = t.Tag
+
+    SimpleDescription.__name__ = SimpleDescription.__qualname__ = F"{t.__name__}Description"
+    return SimpleDescription
+
+
+SIMPLE_DESCRIPTIONS: dict[int, type[a_xdr.Implicit]] = {t.Tag.ClassNumber: get_simple_description(t) for t in (
+    NullData, Boolean, BitString, DoubleLong, DoubleLongUnsigned, OctetString, Visiblestring, UTF8string, BCD, Integer,
+    Long, Unsigned, LongUnsigned, Long64, Long64Unsigned, Enum, Float32, Float64, DateTime, Date, Time, DontCare)}
+"""TypeDescription of simple Data alternatives by tag"""
+
+
+def reinit_TypeDescription(self, value: Union[tuple(SIMPLE_DESCRIPTIONS.values()) + (arrayDescription, structureDescription)]):
+    self.value = value
+
+
+setattr(TypeDescription, "__init__", reinit_TypeDescription)
+
+
+class CompactArray(a_xdr.Implicit, asn1.NamedType, a_xdr.SequenceType):
+    """compact-array: elements without tags, described once"""
+    Tag = a_xdr.Tag(19)
+    __slots__ = _value
+    contents_description: TypeDescription
+    array_contents:       a_xdr.OctetStringType
+
+    def __init__(self, value: tuple[TypeDescription, a_xdr.OctetStringType]):
+        super().__init__(value)
+
+    @classmethod
+    def from_elements(cls,
+                      contents_description: TypeDescription,
+                      array_contents:       a_xdr.OctetStringType):
+        return cls((contents_description, array_contents))
+
+    def get_array(self) -> "Array":
+        """decode array_contents to Data by contents_description"""
+        buf = Buf(memoryview(self.array_contents.value))
+        ret = _get_compact_contents(self.contents_description, buf)
+        if buf.remaining() != 0:
+            raise ValueError(F"in {self.__class__.__name__} got {buf.remaining()} bytes more than described")
+        return ret
+
+    @classmethod
+    def from_array(cls, value: "Array") -> Self:
+        """encode Array with same type of elements"""
+        description = get_type_description(value)
+        buf = byte_buffer.GrowableByteBuffer.allocate()
+        _put_compact_contents(description, value, buf)
+        return cls((description, a_xdr.OctetStringType(buf.getbuffer())))
+
+    @classmethod
+    def from_columns(cls,
+                     types: Sequence[type[asn1.NamedType]],
+                     columns: Sequence[Sequence[int | bytes]]) -> Self:
+        """encode Array of Structure with one element by column, Array of simple with one column.
+        Values are int for numbers and bytes for other"""
+        if len(types) != len(columns):
+            raise ValueError(F"got {len(columns)} columns, expected {len(types)}")
+        if len(n := set(map(len, columns))) != 1:
+            raise ValueError(F"got columns with different length: {n}")
+        n = n.pop()
+        converters = tuple(map(_get_compact_converter, types))
+        description = tuple(SIMPLE_DESCRIPTIONS[t.Tag.ClassNumber]() for t in types)
+        if len(types) == 1:
+            contents = b''.join(map(converters[0], columns[0]))
+            description = description[0]
+        else:
+            contents = b''.join(conv(v) for row in zip(*columns) for conv, v in zip(converters, row))
+            description = structureDescription(description)
+        return cls((arrayDescription((Unsigned16.from_int(n), description)), a_xdr.OctetStringType(contents)))
+
+
 class Data(a_xdr.Choice):
     """Data"""
     def __init__(self, value):
@@ -238,13 +414,13 @@ def get_array_of(t: type[asn1.Type]) -> type[Array]:
 class AnnotationSequenceOfData(asn1.AnnotationGetterMixin, SequenceOfData):
     @classmethod
     def get(cls, buf: Buf) -> Self:
-        if (length := len(cls.__annotations__)) == 0:
+        if (length := len(cls.FIELDS)) == 0:
             return super().get(buf)
         elif length != (l := x690.Length.get(buf).value):
-            raise ValueError(F"got {cls.__name__} length={l}, expected {len(cls.__annotations__)}")
+            raise ValueError(F"got {cls.__name__} length={l}, expected {len(cls.FIELDS)}")
         else:
             ret = list()
-            for el in cls.__annotations__.values():
+            for el in cls.FIELDS:
                 # el: CDT
                 ret.append(el.get(buf))
             return cls(tuple(ret))
@@ -270,11 +446,7 @@ CDT: TypeAlias = Union[
     Long,
     Unsigned,
     LongUnsigned,
-    # compact-array                      [19]  IMPLICIT   SEQUENCE
-    #     {
-    #         contents-description                [0]              TypeDescription,
-    #         array-contents                      [1]   IMPLICIT   OCTET STRING
-    #     },
+    CompactArray,
     Long64,
     Long64Unsigned,
     Enum,
@@ -298,6 +470,219 @@ setattr(Data, "__init__", reinit_Data)
 setattr(SequenceOfData, "__init__", reinit_Data)
 
 
+def get_type_description(value: CDT) -> TypeDescription:
+    """return TypeDescription of Data value, Array described by first element"""
+    match value:
+        case Array(value=()):
+            return arrayDescription((Unsigned16.from_int(0), SIMPLE_DESCRIPTIONS[NullData.Tag.ClassNumber]()))
+        case Array():
+            return arrayDescription((Unsigned16.from_int(len(value.value)), get_type_description(value.value[0])))
+        case Structure():
+            return structureDescription(tuple(map(get_type_description, value.value)))
+        case CompactArray():
+            raise ValueError(F"got {value.__class__.__name__}, not supported in compact-array")
+        case _:
+            return SIMPLE_DESCRIPTIONS[value.Tag.ClassNumber]()
+
+
+def _get_compact_contents(description: TypeDescription, buf: Buf) -> CDT:
+    """decode element of compact-array contents by description"""
+    match description:
+        case arrayDescription():
+            return Array(tuple(_get_compact_contents(description.type_description, buf) for _ in range(int(description.number_of_elements))))
+        case structureDescription():
+            return Structure(tuple(_get_compact_contents(d, buf) for d in description.value))
+        case _:
+            return super(a_xdr.Implicit, Data.get_named_type(description.Tag.ClassNumber)).get(buf)
+
+
+def _put_compact_contents(description: TypeDescription, value: CDT, buf: Buf):
+    """encode element of compact-array contents with checking by description"""
+    match description:
+        case arrayDescription() if isinstance(value, Array) and len(value.value) == int(description.number_of_elements):
+            for el in value.value:
+                _put_compact_contents(description.type_description, el, buf)
+        case structureDescription() if isinstance(value, Structure) and len(value.value) == len(description.value):
+            for d, el in zip(description.value, value.value):
+                _put_compact_contents(d, el, buf)
+        case arrayDescription() | structureDescription():
+            raise ValueError(F"got {value}, not match with {description}")
+        case _ if value.Tag == description.Tag:
+            super(a_xdr.Implicit, value.__class__).put(value, buf)
+        case _:
+            raise ValueError(F"got {value.__class__.__name__}, expected {Data.get_named_type(description.Tag.ClassNumber).__name__}")
+
+
+def _get_compact_converter(t: type[asn1.NamedType]) -> Callable[[int | bytes], bytes]:
+    """return encoder of value to compact-array contents"""
+    if issubclass(t, asn1.Digital) and t.Size > 0:
+        return lambda v: int(v).to_bytes(t.Size, "big", signed=t.SIGNED())
+    else:
+        def convert(v: bytes) -> bytes:
+            buf = byte_buffer.GrowableByteBuffer.allocate()
+            super(a_xdr.Implicit, t).put(t(v), buf)
+            return bytes(buf)
+        return convert
+
+
+DATA_SEQUENCE, DATA_STRING, DATA_BITS, DATA_COMPACT = -1, -2, -3, -4
+"""sizes of Data elements with length prefix"""
+
+
+def _init_Data_sizes() -> tuple[int | None, ...]:
+    """encoded size of Data element by tag, without tag. None if unknown tag"""
+    ret = [None] * 256
+    for tag, n_t in Data.get_named_types().items():
+        if issubclass(n_t, (a_xdr.SizedCoder, a_xdr.BooleanType)):
+            ret[tag] = n_t.Size
+        elif issubclass(n_t, a_xdr.NullType):
+            ret[tag] = 0
+        elif issubclass(n_t, SequenceOfData):
+            ret[tag] = DATA_SEQUENCE
+        elif issubclass(n_t, a_xdr._StringCoder):
+            ret[tag] = DATA_STRING
+        elif issubclass(n_t, a_xdr.BitStringType):
+            ret[tag] = DATA_BITS
+        elif issubclass(n_t, CompactArray):
+            ret[tag] = DATA_COMPACT
+    return tuple(ret)
+
+
+def _skip_TypeDescription(view: memoryview, pos: int) -> int:
+    """return end position of TypeDescription from <pos>"""
+    amount = 1
+    while amount != 0:
+        amount -= 1
+        match view[pos]:
+            case 1:
+                pos += 3
+                amount += 1
+            case 2:
+                if (n := view[pos + 1]) & 0b1000_0000:
+                    length_size = n & 0b0_1111111
+                    n = int.from_bytes(view[pos + 2: (pos := pos + 2 + length_size)], "big")
+                else:
+                    pos += 2
+                amount += n
+            case tag if tag in SIMPLE_DESCRIPTIONS:
+                pos += 1
+            case tag:
+                raise ValueError(F"in TypeDescription got unknown {tag=}")
+    return pos
+
+
+DATA_SIZES = _init_Data_sizes()
+"""encoded size of Data element by tag without tag, DATA_SEQUENCE...DATA_COMPACT for length prefixed, None for unknown"""
+
+
+def _skip_Data(view: memoryview, pos: int, amount: int = 1) -> int:
+    """return end position of <amount> Data elements from <pos>, without decoding"""
+    try:
+        while amount != 0:
+            amount -= 1
+            if (size := DATA_SIZES[view[pos]]) is None:
+                Data.get_named_type(view[pos])
+            pos += 1
+            if size >= 0:
+                pos += size
+                continue
+            elif size == DATA_COMPACT:
+                pos = _skip_TypeDescription(view, pos)
+            if (n := view[pos]) & 0b1000_0000:
+                length_size = n & 0b0_1111111
+                n = int.from_bytes(view[pos + 1: (pos := pos + 1 + length_size)], "big")
+            else:
+                pos += 1
+            if size == DATA_SEQUENCE:
+                amount += n
+            elif size == DATA_STRING or size == DATA_COMPACT:
+                pos += n
+            else:
+                pos += (n + 7) // 8
+    except IndexError:
+        pos = len(view) + 1
+    if pos > len(view):
+        raise BufferError(F"not enough data for Data, need {pos - len(view)} bytes more")
+    return pos
+
+
+def get_Data(buf: Buf) -> CDT:
+    """same as Data.get, with explicit stack instead of recursion for Array and Structure. Leaves are detached after decoding for DetachingByteBuffer"""
+    view = buf.buf
+    pos = start = buf.get_pos()
+    stack: list[tuple[type[SequenceOfData], int, list[CDT]]] = list()
+    try:
+        while True:
+            if (n_t := Data.TAGS[tag := view[pos]]) is None:
+                n_t = Data.get_named_type(tag)
+            size = DATA_SIZES[tag]
+            pos += 1
+            if size == 0:
+                value = n_t.default()
+            elif size == 1:
+                value = n_t.INTERNED[view[pos]]
+                pos += 1
+            elif size > 0:
+                value = n_t(view[pos: (pos := pos + size)])
+            elif size == DATA_COMPACT:
+                (tmp := Buf(view)).set_pos(pos - 1)
+                value = n_t.get(tmp)
+                pos = tmp.get_pos()
+            else:
+                if (n := view[pos]) & 0b1000_0000:
+                    length_size = n & 0b0_1111111
+                    n = int.from_bytes(view[pos + 1: (pos := pos + 1 + length_size)], "big")
+                else:
+                    pos += 1
+                if size == DATA_SEQUENCE:
+                    if n != 0:
+                        stack.append((n_t, n, list()))
+                        continue
+                    value = n_t(tuple())
+                elif size == DATA_STRING:
+                    value = n_t(view[pos: (pos := pos + n)])
+                else:
+                    value = n_t((x690.Length(n), view[pos: (pos := pos + (n + 7) // 8)]))
+            if pos > len(view):
+                raise BufferError(F"{buf} not enough data for {n_t.__name__}")
+            while stack:
+                (cls, n, values) = stack[-1]
+                values.append(value)
+                if len(values) == n:
+                    stack.pop()
+                    value = cls(tuple(values))
+                else:
+                    break
+            else:
+                buf.skip(pos - start)
+                return asn1.detach(value) if buf.DETACHING else value
+    except IndexError:
+        raise BufferError(F"{buf} not enough data for Data") from None
+
+
+def get_Data_length(buf: Buf, pos: int = None) -> int:
+    """return encoded length of Data from <pos>(current by default) without decoding"""
+    if pos is None:
+        pos = buf.get_pos()
+    return _skip_Data(buf.buf, pos) - pos
+
+
+def get_Data_offsets(buf: Buf, pos: int = None) -> array:
+    """return start positions of Array or Structure elements from <pos>(current by default) and end position after them.
+    Decode n-th element: buf.set_pos(offsets[n]); Data.get(buf)"""
+    view = buf.buf
+    if pos is None:
+        pos = buf.get_pos()
+    if DATA_SIZES[view[pos]] != DATA_SEQUENCE:
+        raise TypeError(F"got {Data.get_named_type(view[pos]).__name__}, expected Array or Structure")
+    (tmp := Buf(view)).set_pos(pos + 1)
+    length = x690.Length.get(tmp).value
+    ret = array("Q", (pos := tmp.get_pos(),))
+    for _ in range(length):
+        ret.append(pos := _skip_Data(view, pos))
+    return ret
+
+
 class ProposedQualityOfService(a_xdr.Implicit, Integer8):
     Tag = a_xdr.Tag(0)
 
@@ -0,0 +1,373 @@
+"""decoding to and encoding from native python values: int, bytes, str, bool, float, None, list for Array, tuple for Structure"""
+from struct import Struct
+from typing import Any, Callable, TypeAlias
+from . import asn1, a_xdr, main, x690
+from .byte_buffer import ByteBuffer as Buf, GrowableByteBuffer
+from .compiler import get_chain
+
+_float32 = Struct(">f")
+_float64 = Struct(">d")
+
+
+def _get_bits(n: int, content: bytes) -> str:
+    """bit string as '0' and '1' by length"""
+    return format(int.from_bytes(content, "big"), F"0{len(content) * 8}b")[:n]
+
+
+def _get_converter(t: type[asn1.Type]) -> Callable[[memoryview], Any]:
+    """return converter of encoded contents of simple type"""
+    if issubclass(t, main.Float32):
+        return lambda v: _float32.unpack(v)[0]
+    elif issubclass(t, main.Float64):
+        return lambda v: _float64.unpack(v)[0]
+    elif issubclass(t, main.FixedInteger):
+        unpack = t.STRUCT.unpack
+        return lambda v: unpack(v)[0]
+    elif issubclass(t, asn1.Digital):
+        signed = t.SIGNED()
+        return lambda v: int.from_bytes(v, "big", signed=signed)
+    elif issubclass(t, asn1.EnumeratedType):
+        return lambda v: int.from_bytes(v, "big")
+    elif issubclass(t, asn1.BooleanType):
+        return lambda v: v[0] != 0
+    elif issubclass(t, asn1.NullType):
+        return lambda v: None
+    elif issubclass(t, (asn1.UTF8String, asn1.VisibleString)):
+        return lambda v: str(v, "utf-8")
+    else:
+        return bytes
+
+
+CONVERTERS: tuple[Callable[[memoryview], Any] | None, ...] = tuple(
+    None if (n_t := main.Data.TAGS[tag] or main.Data.get_named_types().get(tag)) is None else _get_converter(n_t)
+    for tag in range(256))
+"""converters of Data contents by tag"""
+
+
+def to_python(value: asn1.Type) -> Any:
+    """convert decoded value to native. Choice except Data as (tag, value), absent Optional as None"""
+    match value:
+        case main.Data():
+            return to_python(value.value)
+        case a_xdr.Choice():
+            return value.value.Tag.ClassNumber, to_python(value.value)
+        case main.Array():
+            return list(map(to_python, value.value))
+        case main.SequenceOfData():
+            return tuple(map(to_python, value.value))
+        case main.CompactArray():
+            return to_python(value.get_array())
+        case a_xdr.Optional() if value.value == b'':
+            return None
+        case a_xdr.SequenceType():
+            return tuple(map(to_python, value.value))
+        case a_xdr.SequenceOfType():
+            return list(map(to_python, value.value))
+        case asn1.NullType():
+            return None
+        case asn1.BitStringType():
+            return value.to_str()
+        case _:
+            return _get_converter(value.__class__)(value.value)
+
+
+def get_Data(buf: Buf) -> Any:
+    """same as to_python(Data.get(buf)) without creating of Data objects"""
+    view = buf.buf
+    pos = start = buf.get_pos()
+    stack: list[tuple[bool, int, list]] = list()
+    try:
+        while True:
+            if (size := main.DATA_SIZES[tag := view[pos]]) is None:
+                main.Data.get_named_type(tag)
+            pos += 1
+            if size >= 0:
+                if pos + size > len(view):
+                    raise BufferError(F"{buf} not enough data for Data")
+                value = CONVERTERS[tag](view[pos: (pos := pos + size)])
+            elif size == main.DATA_COMPACT:
+                (tmp := Buf(view)).set_pos(pos - 1)
+                value = to_python(main.CompactArray.get(tmp))
+                pos = tmp.get_pos()
+            else:
+                if (n := view[pos]) & 0b1000_0000:
+                    length_size = n & 0b0_1111111
+                    n = int.from_bytes(view[pos + 1: (pos := pos + 1 + length_size)], "big")
+                else:
+                    pos += 1
+                if size == main.DATA_SEQUENCE:
+                    if n != 0:
+                        stack.append((tag == main.Array.Tag.ClassNumber, n, list()))
+                        continue
+                    value = list() if tag == main.Array.Tag.ClassNumber else tuple()
+                elif size == main.DATA_STRING:
+                    value = CONVERTERS[tag](view[pos: (pos := pos + n)])
+                else:
+                    value = _get_bits(n, view[pos: (pos := pos + (n + 7) // 8)])
+            if pos > len(view):
+                raise BufferError(F"{buf} not enough data for Data")
+            while stack:
+                (is_array, n, values) = stack[-1]
+                values.append(value)
+                if len(values) == n:
+                    stack.pop()
+                    value = values if is_array else tuple(values)
+                else:
+                    break
+            else:
+                buf.skip(pos - start)
+                return value
+    except IndexError:
+        raise BufferError(F"{buf} not enough data for Data") from None
+
+
+_readers: dict[tuple[type[asn1.Type], int], Callable[[Buf], Any]] = dict()
+
+
+def _get_reader(cls: type[asn1.Type], i: int = 0) -> Callable[[Buf], Any]:
+    """return native decoder by chain[i] of <get>"""
+    if (reader := _readers.get((cls, i))) is not None:
+        return reader
+    definer = get_chain(cls)[i]
+    match definer:
+        case a_xdr.Implicit:
+            tag = cls.Tag.ClassNumber
+            rest = _get_reader(cls, i + 1)
+
+            def reader(buf: Buf) -> Any:
+                if (t := buf.get_uint8()) != tag:
+                    raise ValueError(F"got {a_xdr.Tag(t)}, expected: {cls.Tag}")
+                return rest(buf)
+        case a_xdr.Optional:
+            rest = _get_reader(cls, i + 1)
+
+            def reader(buf: Buf) -> Any:
+                return None if buf.get_uint8() == 0 else rest(buf)
+        case a_xdr.Choice if issubclass(cls, main.Data):
+            reader = get_Data
+        case a_xdr.Choice:
+            def reader(buf: Buf) -> Any:
+                if (n_t := cls.TAGS[tag := buf.peek_uint8()]) is None:
+                    n_t = cls.get_named_type(tag)
+                return tag, _get_reader(n_t)(buf)
+        case a_xdr.SequenceType:
+            fields = cls.FIELDS
+
+            def reader(buf: Buf) -> Any:
+                return tuple(_get_reader(el)(buf) for el in fields)
+        case a_xdr.SequenceOfType:
+            def reader(buf: Buf) -> Any:
+                el_reader = _get_reader(cls.Type)
+                return [el_reader(buf) for _ in range(x690.Length.get(buf).value)]
+        case a_xdr.SizedCoder | a_xdr.BooleanType:
+            size = cls.Size
+            convert = _get_converter(cls)
+
+            def reader(buf: Buf) -> Any:
+                return convert(buf.read(size))
+        case a_xdr.NullType:
+            def reader(buf: Buf) -> Any:
+                return None
+        case a_xdr._StringCoder:
+            convert = _get_converter(cls)
+
+            def reader(buf: Buf) -> Any:
+                return convert(buf.read(x690.Length.get(buf).value))
+        case _:
+            get = definer.__dict__["get"].__func__
+
+            def reader(buf: Buf) -> Any:
+                return to_python(get(cls, buf))
+    _readers[(cls, i)] = reader
+    return reader
+
+
+def get(cls: type[asn1.Type], buf: Buf) -> Any:
+    """same as to_python(cls.get(buf)) without creating of objects for Data"""
+    return _get_reader(cls)(buf)
+
+
+def _get_encoder(t: type[asn1.Type]) -> Callable[[Any], bytes]:
+    """return encoder of native value to contents of simple type, inverse of converter"""
+    if issubclass(t, main.Float32):
+        return _float32.pack
+    elif issubclass(t, main.Float64):
+        return _float64.pack
+    elif issubclass(t, main.FixedInteger):
+        return t.STRUCT.pack
+    elif issubclass(t, asn1.Digital) and t.Size > 0:
+        size, signed = t.Size, t.SIGNED()
+        return lambda v: int(v).to_bytes(size, "big", signed=signed)
+    elif issubclass(t, asn1.Digital):
+        return lambda v: t.from_int(int(v)).value
+    elif issubclass(t, asn1.EnumeratedType):
+        return lambda v: int(v).to_bytes(t.Size, "big")
+    elif issubclass(t, asn1.BooleanType):
+        return lambda v: b'\x01' if v else b'\x00'
+    elif issubclass(t, (asn1.UTF8String, asn1.VisibleString)):
+        return lambda v: v.encode("utf-8") if isinstance(v, str) else bytes(v)
+    elif issubclass(t, a_xdr.SizedCoder):
+        def encode(v: bytes) -> bytes:
+            if len(v) != t.Size:
+                raise ValueError(F"{t.__name__} got value with length {len(v)}, expected {t.Size}")
+            return v
+        return encode
+    else:
+        return bytes
+
+
+def _get_header(tag: bytes, n: int) -> bytes:
+    """tag(may be empty) with x690 length"""
+    if n < 0x80:
+        return tag + bytes((n,))
+    else:
+        x690.Length(n).put(buf := GrowableByteBuffer.allocate(8))
+        return tag + bytes(buf)
+
+
+Writer: TypeAlias = Callable[[Any, Buf], None]
+Hint: TypeAlias = type[asn1.Type] | main.TypeDescription | list | tuple
+"""main class, TypeDescription, [hint] for Array or (hint, ...) for Structure"""
+_writers: dict[tuple[type[asn1.Type], int], Writer] = dict()
+
+
+def _get_writer(cls: type[asn1.Type], i: int = 0) -> Writer:
+    """return native encoder by chain[i] of <put>"""
+    if (writer := _writers.get((cls, i))) is not None:
+        return writer
+    definer = get_chain(cls, "put")[i]
+    match definer:
+        case a_xdr.Implicit if get_chain(cls, "put")[i + 1] in (a_xdr.SizedCoder, a_xdr.BooleanType):
+            tag = bytes((cls.Tag.ClassNumber,))
+            encode = _get_encoder(cls)
+
+            def writer(value: Any, buf: Buf):
+                buf.write(tag + encode(value))
+        case a_xdr.Implicit if get_chain(cls, "put")[i + 1] is a_xdr._StringCoder:
+            tag = bytes((cls.Tag.ClassNumber,))
+            encode = _get_encoder(cls)
+
+            def writer(value: Any, buf: Buf):
+                data = encode(value)
+                buf.write(_get_header(tag, len(data)) + data)
+        case a_xdr.Implicit:
+            tag = cls.Tag.ClassNumber
+            rest = _get_writer(cls, i + 1)
+
+            def writer(value: Any, buf: Buf):
+                buf.put_uint8(tag)
+                rest(value, buf)
+        case a_xdr.Optional:
+            rest = _get_writer(cls, i + 1)
+
+            def writer(value: Any, buf: Buf):
+                if value is None:
+                    buf.put_uint8(0)
+                else:
+                    buf.put_uint8(1)
+                    rest(value, buf)
+        case a_xdr.Choice if issubclass(cls, main.Data):
+            def writer(value: asn1.Type | tuple[Hint, Any], buf: Buf):
+                """Data by object or pair (hint, value)"""
+                if isinstance(value, asn1.Type):
+                    value.put(buf)
+                else:
+                    get_writer(value[0])(value[1], buf)
+        case a_xdr.Choice:
+            def writer(value: tuple[int, Any], buf: Buf):
+                _get_writer(cls.get_named_type(value[0]))(value[1], buf)
+        case a_xdr.SequenceType:
+            fields = cls.FIELDS
+
+            def writer(value: tuple, buf: Buf):
+                if len(value) != len(fields):
+                    raise ValueError(F"for {cls.__name__} got {len(value)} elements, expected {len(fields)}")
+                for el, v in zip(fields, value):
+                    _get_writer(el)(v, buf)
+        case a_xdr.SequenceOfType:
+            def writer(value: list, buf: Buf):
+                buf.write(_get_header(b'', len(value)))
+                el_writer = _get_writer(cls.Type)
+                for v in value:
+                    el_writer(v, buf)
+        case a_xdr.SizedCoder | a_xdr.BooleanType:
+            encode = _get_encoder(cls)
+
+            def writer(value: Any, buf: Buf):
+                buf.write(encode(value))
+        case a_xdr.NullType:
+            def writer(value: None, buf: Buf):
+                """not carry info"""
+        case a_xdr._StringCoder:
+            encode = _get_encoder(cls)
+
+            def writer(value: Any, buf: Buf):
+                data = encode(value)
+                buf.write(_get_header(b'', len(data)) + data)
+        case _:
+            put = definer.__dict__["put"]
+
+            def writer(value: Any, buf: Buf):
+                put(value if isinstance(value, asn1.Type) else cls.from_str(value), buf)
+    _writers[(cls, i)] = writer
+    return writer
+
+
+def _get_sequence_writer(tag: int, writers: Callable[[int], list[Writer]]) -> Writer:
+    """writer of Array or Structure with writers of elements by amount"""
+    tag = bytes((tag,))
+
+    def writer(value: list | tuple, buf: Buf):
+        buf.write(_get_header(tag, len(value)))
+        for w, v in zip(writers(len(value)), value):
+            w(v, buf)
+    return writer
+
+
+def get_writer(hint: Hint) -> Writer:
+    """return native encoder by type hint"""
+    match hint:
+        case type():
+            return _get_writer(hint)
+        case list() if len(hint) == 1:
+            el_writer = get_writer(hint[0])
+            return _get_sequence_writer(main.Array.Tag.ClassNumber, lambda n: [el_writer] * n)
+        case tuple():
+            writers = list(map(get_writer, hint))
+
+            def get_writers(n: int) -> list[Writer]:
+                if n != len(writers):
+                    raise ValueError(F"got Structure with {n} elements, expected {len(writers)}")
+                return writers
+            return _get_sequence_writer(main.Structure.Tag.ClassNumber, get_writers)
+        case main.arrayDescription():
+            el_writer = get_writer(hint.type_description)
+            number = int(hint.number_of_elements)
+
+            def get_writers(n: int) -> list[Writer]:
+                if n != number:
+                    raise ValueError(F"got Array with {n} elements, expected {number}")
+                return [el_writer] * n
+            return _get_sequence_writer(main.Array.Tag.ClassNumber, get_writers)
+        case main.structureDescription():
+            return get_writer(tuple(hint.value))
+        case a_xdr.NullType() if isinstance(hint, asn1.NamedType):
+            """simple description"""
+            return _get_writer(main.Data.get_named_type(hint.Tag.ClassNumber))
+        case _:
+            raise TypeError(F"got type hint {hint}, expected main class, TypeDescription, list or tuple")
+
+
+def put(hint: Hint, value: Any, buf: Buf) -> int:
+    """encode native value by type hint to buffer, return amount of bytes"""
+    pos = buf.get_pos()
+    get_writer(hint)(value, buf)
+    return buf.get_pos() - pos
+
+
+def create_buf(hint: Hint, value: Any) -> GrowableByteBuffer:
+    """same as a_xdr.create_growable_buf for native value"""
+    buf = GrowableByteBuffer.allocate()
+    put(hint, value, buf)
+    buf.set_pos(0)
+    return buf
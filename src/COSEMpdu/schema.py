@@ -0,0 +1,89 @@
+"""introspection of types by metadata, frozen with class creation: elements, tags and A-XDR encoded size"""
+from dataclasses import dataclass
+from types import MappingProxyType, ModuleType
+from typing import Mapping
+from . import asn1, a_xdr, ber, main, x690
+from .compiler import get_chain
+
+
+@dataclass(frozen=True)
+class Schema:
+    type: type[asn1.Type]
+    names: tuple[str, ...]
+    """names of SequenceType elements, empty for other"""
+    elements: tuple[type[asn1.Type], ...]
+    """types of SequenceType elements, alternatives of Choice, type of SequenceOfType element"""
+    tags: Mapping[int, type[asn1.Type]]
+    """alternatives of Choice by tag, empty for other"""
+    size: int
+    """length of contents, -1 is unrestricted"""
+    min_size: int
+    """minimal length of encoding"""
+    max_size: int | None
+    """maximal length of encoding, None if unbounded"""
+
+
+SCHEMAS: dict[type[asn1.Type], Schema] = dict()
+"""built schemas by type"""
+
+
+def get_encoded_size(cls: type[asn1.Type], i: int = 0, visited: frozenset[type] = frozenset()) -> tuple[int, int | None]:
+    """return minimal and maximal(None if unbounded) length of encoding by put of chain[i]"""
+    if cls in visited and i == 0:
+        return 0, None
+    visited |= {cls}
+    match get_chain(cls, "put")[i]:
+        case a_xdr.Implicit:
+            min_, max_ = get_encoded_size(cls, i + 1, visited)
+            return 1 + min_, None if max_ is None else 1 + max_
+        case a_xdr.Optional:
+            _, max_ = get_encoded_size(cls, i + 1, visited)
+            return 1, None if max_ is None else 1 + max_
+        case a_xdr.Choice:
+            sizes = [get_encoded_size(el, 0, visited) for el in cls.get_named_types().values()]
+            return min(s[0] for s in sizes), None if any(s[1] is None for s in sizes) else max(s[1] for s in sizes)
+        case a_xdr.SequenceType:
+            return _get_sum(cls.FIELDS, visited)
+        case a_xdr.SequenceOfType if issubclass(cls, main.AnnotationSequenceOfData) and len(cls.FIELDS) != 0:
+            min_, max_ = _get_sum(cls.FIELDS, visited)
+            header = len(x690.Length(len(cls.FIELDS)))
+            return header + min_, None if max_ is None else header + max_
+        case a_xdr.SizedCoder | a_xdr.BooleanType | a_xdr.NullType:
+            return cls.Size, cls.Size
+        case a_xdr.SequenceOfType | a_xdr._StringCoder | a_xdr.BitStringType:
+            return 1, None
+        case ber.BitStringType:
+            return len(cls.Tag) + 2, None
+        case a_xdr.EXPLICIT:
+            return 2, None
+        case _:
+            """unknown coding"""
+            return 0, None
+
+
+def _get_sum(types: tuple[type[asn1.Type], ...], visited: frozenset[type]) -> tuple[int, int | None]:
+    sizes = [get_encoded_size(el, 0, visited) for el in types]
+    return sum(s[0] for s in sizes), None if any(s[1] is None for s in sizes) else sum(s[1] for s in sizes)
+
+
+def get_schema(cls: type[asn1.Type]) -> Schema:
+    """return schema of type, build with first use"""
+    if (ret := SCHEMAS.get(cls)) is None:
+        names = getattr(cls, "NAMES", ())
+        if len(names) != 0:
+            elements = cls.FIELDS
+        elif issubclass(cls, asn1.Choice):
+            elements = cls.get_elements()
+        elif issubclass(cls, asn1.SequenceOfType):
+            elements = (cls.Type,)
+        else:
+            elements = ()
+        tags = MappingProxyType(cls.get_named_types() if issubclass(cls, asn1.Choice) else {})
+        ret = SCHEMAS[cls] = Schema(cls, names, elements, tags, cls.Size, *get_encoded_size(cls))
+    return ret
+
+
+def get_schemas(module: ModuleType = main) -> dict[str, Schema]:
+    """return schemas of all types of module by name"""
+    return {name: get_schema(t) for name, t in vars(module).items()
+            if isinstance(t, type) and issubclass(t, asn1.Type) and t.__module__ == module.__name__ and len(get_chain(t, "put")) != 0}
@@ -0,0 +1,207 @@
+"""incremental decoding of APDU from byte stream"""
+from typing import Callable
+from enum import IntEnum
+from . import asn1, a_xdr, ber, main
+from .byte_buffer import ByteBuffer as Buf
+from .compiler import get_chain
+
+
+class Op(IntEnum):
+    """scanner operations"""
+    TYPE = 0
+    TAG = 1
+    FLAG = 2
+    CHOICE = 3
+    BYTES = 4
+    LENGTH = 5
+    REPEAT = 6
+    X690_TAG = 7
+    BITS = 8
+    """after LENGTH only"""
+    FIELDS = 9
+    """after LENGTH only"""
+
+
+_plans: dict[tuple[type, int], tuple[tuple, ...]] = dict()
+
+
+def _get_plan(cls: type[asn1.Type], i: int) -> tuple[tuple, ...]:
+    """operations for scan by <get> of chain[i] in order of stack pushing"""
+    if (plan := _plans.get((cls, i))) is not None:
+        return plan
+    match get_chain(cls)[i]:
+        case a_xdr.Implicit:
+            plan = ((Op.TYPE, cls, i + 1), (Op.TAG, cls))
+        case a_xdr.Optional:
+            plan = ((Op.FLAG, cls, i + 1),)
+        case a_xdr.Choice:
+            plan = ((Op.CHOICE, cls),)
+        case main.AnnotationSequenceOfData if len(cls.FIELDS) == 0:
+            plan = ((Op.TYPE, cls, i + 1),)
+        case main.AnnotationSequenceOfData:
+            plan = ((Op.LENGTH, Op.FIELDS, cls),)
+        case a_xdr.SequenceType:
+            plan = tuple((Op.TYPE, el, 0) for el in reversed(cls.FIELDS))
+        case a_xdr.SequenceOfType:
+            plan = ((Op.LENGTH, Op.REPEAT, cls.Type),)
+        case a_xdr.SizedCoder | a_xdr.BooleanType:
+            plan = ((Op.BYTES, cls.Size),)
+        case a_xdr.NullType:
+            plan = tuple()
+        case a_xdr._StringCoder:
+            plan = ((Op.LENGTH, Op.BYTES, None),)
+        case a_xdr.BitStringType:
+            plan = ((Op.LENGTH, Op.BITS, None),)
+        case ber.BitStringType:
+            plan = ((Op.LENGTH, Op.BYTES, None), (Op.X690_TAG,))
+        case kind:
+            raise TypeError(F"for {cls.__name__} got unsupported by scanner <get> of {kind.__name__}")
+    _plans[(cls, i)] = plan
+    return plan
+
+
+class StreamDecoder:
+    """push-parser: feed chunks of stream, get decoded APDUs.
+    Scanning of frame border keeps state between chunks, complete frame is decoded once"""
+    type: type[asn1.Type]
+    decoder: Callable[[Buf], asn1.Type]
+    __data: bytearray
+    __pos: int
+    __stack: list[tuple]
+
+    def __init__(self,
+                 type_: type[asn1.Type] = main.XDLMSAPDU,
+                 decoder: Callable[[Buf], asn1.Type] = None):
+        self.type = type_
+        """ type of frame """
+        self.decoder = type_.get if decoder is None else decoder
+        """ decode complete frame, can be compiler.compile_decoder(type_) """
+        self.reset()
+
+    def reset(self):
+        """drop partial frame, use after error"""
+        self.__data = bytearray()
+        """ received bytes of current frame only """
+        self.__pos = 0
+        """ scanned position in data """
+        self.__stack = [(Op.TYPE, self.type, 0)]
+
+    def __len__(self):
+        """amount of received bytes of partial frame"""
+        return len(self.__data)
+
+    def feed(self, chunk: bytes | bytearray | memoryview) -> list[asn1.Type]:
+        """return decoded APDUs completed by chunk"""
+        ret = list()
+        self.__data += chunk
+        start = 0
+        """ begin of current frame in data """
+        while not (begin := self.__stack == [(Op.TYPE, self.type, 0)]) or self.__pos < len(self.__data):
+            if begin:
+                """frame begin: try decode direct once, scan only incomplete frame"""
+                buf = Buf(memoryview(self.__data)[start:])
+                try:
+                    ret.append(self.decoder(buf))
+                    self.__pos = start = start + buf.get_pos()
+                    continue
+                except BufferError:
+                    pass
+                finally:
+                    del buf
+            if self.__scan() != 0:
+                break
+            ret.append(self.decoder(Buf(memoryview(self.__data)[start: self.__pos])))
+            start = self.__pos
+            self.__stack = [(Op.TYPE, self.type, 0)]
+        if start != 0:
+            """rest bytes belong to next frame, new data keeps the decoded frames buffer untouched"""
+            self.__data = self.__data[start:]
+            self.__pos -= start
+        return ret
+
+    def __scan(self) -> int:
+        """advance scanning, return amount of necessary bytes, 0 if frame complete"""
+        data, pos, stack = self.__data, self.__pos, self.__stack
+        try:
+            while stack:
+                op = stack[-1]
+                available = len(data) - pos
+                match op[0]:
+                    case Op.TYPE:
+                        stack.pop()
+                        stack.extend(_get_plan(op[1], op[2]))
+                    case Op.TAG:
+                        if available < 1:
+                            return 1
+                        if data[pos] != (cls := op[1]).Tag.ClassNumber:
+                            raise ValueError(F"got {a_xdr.Tag(data[pos])}, expected: {cls.Tag}")
+                        pos += 1
+                        stack.pop()
+                    case Op.FLAG:
+                        if available < 1:
+                            return 1
+                        stack.pop()
+                        if data[pos] != 0:
+                            stack.append((Op.TYPE, op[1], op[2]))
+                        pos += 1
+                    case Op.CHOICE:
+                        if available < 1:
+                            return 1
+                        if (n_t := (cls := op[1]).TAGS[data[pos]]) is None:
+                            n_t = cls.get_named_type(data[pos])
+                        stack[-1] = (Op.TYPE, n_t, 0)
+                    case Op.BYTES:
+                        if available < op[1]:
+                            return op[1] - available
+                        pos += op[1]
+                        stack.pop()
+                    case Op.LENGTH:
+                        if available < 1:
+                            return 1
+                        if (n := data[pos]) & 0b1000_0000:
+                            if (size := n & 0b0_1111111) == 0b0_1111111:
+                                n, size = -1, 0
+                            elif available < 1 + size:
+                                return 1 + size - available
+                            else:
+                                n = int.from_bytes(data[pos + 1: pos + 1 + size], "big")
+                            pos += 1 + size
+                        else:
+                            pos += 1
+                        stack.pop()
+                        match op[1]:
+                            case Op.BYTES:
+                                if n < 0:
+                                    raise ValueError("got indefinite length of string")
+                                stack.append((Op.BYTES, n))
+                            case Op.BITS:
+                                stack.append((Op.BYTES, (n + 7) // 8))
+                            case Op.REPEAT:
+                                if n > 0:
+                                    stack.append((Op.REPEAT, op[2], n))
+                            case Op.FIELDS:
+                                if n != len((cls := op[2]).FIELDS):
+                                    raise ValueError(F"got {cls.__name__} length={n}, expected {len(cls.FIELDS)}")
+                                stack.extend((Op.TYPE, el, 0) for el in reversed(cls.FIELDS))
+                    case Op.REPEAT:
+                        if op[2] == 1:
+                            stack.pop()
+                        else:
+                            stack[-1] = (Op.REPEAT, op[1], op[2] - 1)
+                        stack.append((Op.TYPE, op[1], 0))
+                    case Op.X690_TAG:
+                        if available < 1:
+                            return 1
+                        size = 1
+                        if data[pos] & 0b0001_1111 == 0b0001_1111:
+                            while True:
+                                if available < size + 1:
+                                    return size + 1 - available
+                                size += 1
+                                if data[pos + size - 1] & 0b1000_0000 == 0:
+                                    break
+                        pos += size
+                        stack.pop()
+            return 0
+        finally:
+            self.__pos = pos
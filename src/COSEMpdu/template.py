@@ -0,0 +1,132 @@
+"""pre-encoded frames with patchable fields"""
+from typing import Self
+from . import asn1, a_xdr, x690
+from .byte_buffer import ByteBuffer as Buf
+from .compiler import get_chain, encode
+
+
+def _find(value: asn1.Type, pos: int, path: tuple[int, ...], targets: dict[tuple[int, ...] | int, str], ret: dict[str, list[tuple[int, asn1.Type]]]):
+    """fill <ret> with positions of targets by path or id in encoding of value from <pos>.
+    Path is indexes of elements in sequences, choices are transparent, the innermost value of path is kept"""
+    if (name := targets.get(path)) is not None:
+        ret[name] = [(pos, value)]
+    if (name := targets.get(id(value))) is not None:
+        ret.setdefault(name, list()).append((pos, value))
+    for definer in get_chain(value.__class__, "put"):
+        match definer:
+            case a_xdr.Implicit:
+                pos += 1
+            case a_xdr.Optional if value.value == b'':
+                return
+            case a_xdr.Optional:
+                pos += 1
+            case a_xdr.Choice:
+                _find(value.value, pos, path, targets, ret)
+                return
+            case a_xdr.SequenceType:
+                for i, el in enumerate(value.value):
+                    _find(el, pos, path + (i,), targets, ret)
+                    pos += len(el)
+                return
+            case a_xdr.SequenceOfType:
+                pos += len(x690.Length(len(value.value)))
+                for i, el in enumerate(value.value):
+                    _find(el, pos, path + (i,), targets, ret)
+                    pos += len(el)
+                return
+            case a_xdr.EXPLICIT:
+                _find(value.value, pos + 1 + len(x690.Length(len(value.value))), path, targets, ret)
+                return
+            case _:
+                return
+
+
+def _get_path(value: asn1.Type, path: tuple[int | str, ...]) -> tuple[int, ...]:
+    """return path with indexes instead of element names"""
+    ret = list()
+    for step in path:
+        while not isinstance(value, (asn1.SequenceType, asn1.SequenceOfType)):
+            if not isinstance(value, asn1.Type) or isinstance(value, asn1.SimpleType):
+                raise ValueError(F"not found element {step} of {path=}")
+            value = value.value
+        if isinstance(step, str):
+            if step not in value.NAMES:
+                raise ValueError(F"not found element {step} of {path=} in {value.__class__.__name__}")
+            step = value.NAMES.index(step)
+        if not 0 <= step < len(value.value):
+            raise ValueError(F"not found element {step} of {path=} in {value.__class__.__name__}")
+        value = value.value[step]
+        ret.append(step)
+    return tuple(ret)
+
+
+class Field:
+    """patchable part of template"""
+    __slots__ = ("start", "size", "length", "type", "signed")
+    start: int
+    size: int
+    length: int | None
+    type: type[asn1.Type]
+    signed: bool | None
+
+    def __init__(self, start: int, value: asn1.Type):
+        self.start = start
+        """ position of encoding in frame """
+        self.size = len(value)
+        """ length of encoding """
+        self.length = len(value.value) if isinstance(getattr(value, "value", None), (bytes, bytearray, memoryview)) else None
+        """ length of contents at end of encoding, None if bytes is not allowed """
+        self.type = value.__class__
+        if isinstance(value, asn1.Digital):
+            self.signed = value.SIGNED()
+        elif isinstance(value, asn1.EnumeratedType):
+            self.signed = False
+        else:
+            self.signed = None
+            """ None if int is not allowed """
+
+    def patch(self, frame: bytearray | memoryview, value: asn1.Type | int | bytes):
+        """replace encoding by object with same length, contents by int or bytes"""
+        match value:
+            case int() if self.signed is not None and self.type.Size > 0:
+                frame[self.start + self.size - self.type.Size: self.start + self.size] = value.to_bytes(self.type.Size, "big", signed=self.signed)
+            case bytes() | bytearray() | memoryview() if len(value) == self.length:
+                frame[self.start + self.size - self.length: self.start + self.size] = value
+            case asn1.Type() if len(value) == self.size:
+                value.put(Buf(memoryview(frame)[self.start: self.start + self.size]))
+            case _:
+                raise ValueError(F"for {self.type.__name__} with length {self.size} got not patchable {value}")
+
+
+class Template:
+    """encoded once frame, new frames by copy and patch of nominated fields"""
+    __slots__ = ("frame", "fields")
+    frame: bytes
+    fields: dict[str, Field]
+
+    def __init__(self, value: asn1.Type, **fields: asn1.Type | tuple[int | str, ...]):
+        """nominate fields by path(indexes or names of elements) or by objects from value.
+        Object must be used once in value, shared(e.g. interned) objects are nominated by path"""
+        self.frame = bytes(encode(value))
+        found: dict[str, list[tuple[int, asn1.Type]]] = dict()
+        _find(value, 0, (), {(_get_path(value, v) if isinstance(v, tuple) else id(v)): name for name, v in fields.items()}, found)
+        if len(missing := fields.keys() - found.keys()) != 0:
+            raise ValueError(F"not found in {value.__class__.__name__} fields: {', '.join(missing)}")
+        for name, positions in found.items():
+            if len(positions) != 1:
+                raise ValueError(F"field {name} is found {len(positions)} times in {value.__class__.__name__}, nominate it by path")
+        self.fields = {name: Field(*found[name][0]) for name in fields}
+
+    def create(self, **values: asn1.Type | int | bytes) -> bytearray:
+        """return copy of frame with patched fields"""
+        ret = bytearray(self.frame)
+        for name, value in values.items():
+            self.fields[name].patch(ret, value)
+        return ret
+
+    def replace(self, **values: asn1.Type | int | bytes) -> Self:
+        """return template with new default values"""
+        ret = self.__class__.__new__(self.__class__)
+        ret.frame = bytes(self.create(**values))
+        ret.fields = self.fields
+        return ret
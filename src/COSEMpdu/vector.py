@@ -0,0 +1,194 @@
+"""vectorized decoding of homogeneous Data arrays, need numpy"""
+from typing import Sequence
+from . import a_xdr, main, x690
+from .byte_buffer import ByteBuffer as Buf
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _init_dtypes() -> tuple[str | None, ...]:
+    """big-endian dtype of Data element by tag, None if not fixed size number"""
+    types = (
+        (main.Float32, ">f4"), (main.Float64, ">f8"),
+        (main.Integer8, "i1"), (main.Integer16, ">i2"), (main.Integer32, ">i4"), (main.Integer64, ">i8"),
+        (main.Unsigned8, "u1"), (main.Unsigned16, ">u2"), (main.Unsigned32, ">u4"), (main.Unsigned64, ">u8"))
+    ret = [None] * 256
+    for tag, n_t in main.Data.get_named_types().items():
+        for t, dtype in types:
+            if issubclass(n_t, t):
+                ret[tag] = dtype
+                break
+    return tuple(ret)
+
+
+DTYPES = _init_dtypes()
+"""numpy dtype string by tag of Data"""
+
+
+def _check_numpy():
+    if np is None:
+        raise ModuleNotFoundError("numpy is necessary for vectorized decoding, install COSEMpdu[numpy]")
+
+
+def get_array(buf: Buf) -> "np.ndarray | None":
+    """return strided view to values of Array with same fixed size elements and increase position.
+    None with not changed position if layout is other, use Data.get in this case"""
+    _check_numpy()
+    view = buf.buf
+    pos = buf.get_pos()
+    if view[pos] != main.Array.Tag.ClassNumber:
+        return None
+    buf.skip(1)
+    n = x690.Length.get(buf).value
+    start = buf.get_pos()
+    if (n <= 0
+            or start >= len(view)
+            or (dtype := DTYPES[tag := view[start]]) is None):
+        buf.set_pos(pos)
+        return None
+    stride = 1 + (dtype := np.dtype(dtype)).itemsize
+    if (end := start + n * stride) > len(view):
+        buf.set_pos(pos)
+        raise BufferError(F"{buf} not enough data for Array with {n} elements")
+    if not (np.frombuffer(view, np.uint8, n * stride, start)[::stride] == tag).all():
+        buf.set_pos(pos)
+        return None
+    buf.skip(end - start)
+    return np.ndarray((n,), dtype, view, start + 1, (stride,))
+
+
+def _get_row_layout(view: memoryview, pos: int) -> tuple[list[int], list[tuple[str | tuple, int]], int]:
+    """return positions of tags and lengths(signature), fields(format, offset) and size of Data element from <pos>"""
+    signature = list()
+    fields = list()
+    tmp = Buf(view)
+    p = pos
+    pending = 1
+    while pending != 0:
+        pending -= 1
+        if (n_t := main.Data.TAGS[tag := view[p]]) is None:
+            n_t = main.Data.get_named_type(tag)
+        if issubclass(n_t, (a_xdr.SizedCoder, a_xdr.BooleanType, a_xdr.NullType)):
+            header_end = p + 1
+            size = n_t.Size
+        else:
+            tmp.set_pos(p + 1)
+            n = x690.Length.get(tmp).value
+            header_end = tmp.get_pos()
+            if issubclass(n_t, main.SequenceOfData):
+                pending += n
+                size = 0
+            elif issubclass(n_t, a_xdr.BitStringType):
+                size = (n + 7) // 8
+            elif issubclass(n_t, a_xdr._StringCoder):
+                size = n
+            else:
+                raise TypeError(F"got {n_t.__name__}, not supported in row")
+        signature.extend(range(p - pos, header_end - pos))
+        if size != 0:
+            fields.append((DTYPES[tag] or (np.uint8, (size,)), header_end - pos))
+        p = header_end + size
+    return signature, fields, p - pos
+
+
+def get_table(buf: Buf, names: Sequence[str] = None) -> "np.ndarray | None":
+    """return structured view to rows of Array of Structure with same layout and increase position.
+    Fields are values of leafs in order(f0, f1, ... by default), strings as uint8 subarray.
+    None with not changed position if layout is other, use Data.get in this case"""
+    _check_numpy()
+    view = buf.buf
+    pos = buf.get_pos()
+    if view[pos] != main.Array.Tag.ClassNumber:
+        return None
+    buf.skip(1)
+    n = x690.Length.get(buf).value
+    start = buf.get_pos()
+    buf.set_pos(pos)
+    if (n <= 0
+            or start >= len(view)
+            or view[start] != main.Structure.Tag.ClassNumber):
+        return None
+    try:
+        signature, fields, row_size = _get_row_layout(view, start)
+    except (IndexError, BufferError, TypeError):
+        return None
+    if (end := start + n * row_size) > len(view):
+        return None
+    rows = np.frombuffer(view, np.uint8, n * row_size, start).reshape(n, row_size)
+    if not (rows[:, signature] == rows[0, signature]).all():
+        return None
+    if names is None:
+        names = [F"f{i}" for i in range(len(fields))]
+    elif len(names) != len(fields):
+        raise ValueError(F"got {len(names)} names, expected {len(fields)}")
+    dtype = np.dtype({
+        "names": names,
+        "formats": [f for f, _ in fields],
+        "offsets": [offset for _, offset in fields],
+        "itemsize": row_size})
+    buf.skip(end - pos)
+    return np.ndarray((n,), dtype, view, start, (row_size,))
+
+
+def get_columns(buf: Buf, names: Sequence[str] = None) -> "dict[str, np.ndarray] | None":
+    """same as get_table, return view by columns"""
+    if (table := get_table(buf, names)) is None:
+        return None
+    return {name: table[name] for name in table.dtype.names}
+
+
+def _get_description_layout(description: main.TypeDescription, offset: int = 0) -> tuple[list[tuple[str | tuple, int]], int]:
+    """return fields(format, offset) and size of compact-array element by description"""
+    match description:
+        case main.arrayDescription():
+            fields = list()
+            for _ in range(int(description.number_of_elements)):
+                f, offset = _get_description_layout(description.type_description, offset)
+                fields.extend(f)
+            return fields, offset
+        case main.structureDescription():
+            fields = list()
+            for d in description.value:
+                f, offset = _get_description_layout(d, offset)
+                fields.extend(f)
+            return fields, offset
+        case _:
+            n_t = main.Data.get_named_type(tag := description.Tag.ClassNumber)
+            if not issubclass(n_t, (a_xdr.SizedCoder, a_xdr.BooleanType, a_xdr.NullType)):
+                raise TypeError(F"got {n_t.__name__}, not fixed size")
+            if n_t.Size == 0:
+                return [], offset
+            return [(DTYPES[tag] or (np.uint8, (n_t.Size,)), offset)], offset + n_t.Size
+
+
+def get_compact_table(value: main.CompactArray, names: Sequence[str] = None) -> "np.ndarray | None":
+    """return view to array_contents by one description of elements: values of simple elements, rows with fields for Structure.
+    None if element is not fixed size, use value.get_array() in this case"""
+    _check_numpy()
+    description = value.contents_description
+    if not isinstance(description, main.arrayDescription):
+        raise ValueError(F"got {description}, expected array description")
+    n = int(description.number_of_elements)
+    try:
+        fields, size = _get_description_layout(description.type_description)
+    except TypeError:
+        return None
+    if len(fields) == 0:
+        return None
+    contents = value.array_contents.value
+    if n * size != len(contents):
+        raise ValueError(F"got array-contents length {len(contents)}, expected {n * size}")
+    if not isinstance(description.type_description, (main.arrayDescription, main.structureDescription)):
+        return np.ndarray((n,), fields[0][0], contents, 0, (size,))
+    if names is None:
+        names = [F"f{i}" for i in range(len(fields))]
+    elif len(names) != len(fields):
+        raise ValueError(F"got {len(names)} names, expected {len(fields)}")
+    dtype = np.dtype({
+        "names": names,
+        "formats": [f for f, _ in fields],
+        "offsets": [offset for _, offset in fields],
+        "itemsize": size})
+    return np.ndarray((n,), dtype, contents, 0, (size,))
@@ -69,17 +69,11 @@ class Length(ComponentEDV):
         if self.value < 0x80:
             return buf.put_uint8(self.value)
         elif self.value < 0x1_00:
-            _length1.pack_into(buf.buf, 0,
-                               0x81, self.value)
-            return 2
+            return buf.write(_length1.pack(0x81, self.value))
         elif self.value < 0x1_00_00:
-            _length2.pack_into(buf.buf, 0,
-                               0x82, self.value)
-            return 3
+            return buf.write(_length2.pack(0x82, self.value))
         elif self.value < 0x1_00_00_00_00:
-            _length4.pack_into(buf.buf, 0,
-                               0x84, self.value)
-            return 5
+            return buf.write(_length4.pack(0x84, self.value))
         else:
             amount = int(log(self.value, 256)) + 1
             ret: int = buf.put_uint8(0x80 + amount)
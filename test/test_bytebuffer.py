@@ -1,5 +1,6 @@
 import unittest
-from src.COSEMpdu.byte_buffer import ByteBuffer
+from src.COSEMpdu.byte_buffer import ByteBuffer, GrowableByteBuffer, BufferPool
+from src.COSEMpdu import a_xdr, main as c_pdu
 
 
 class TestType(unittest.TestCase):
@@ -17,3 +18,91 @@ class TestType(unittest.TestCase):
         print(buf)
         buf.read()
         print(new_buf)
+
+    def test_GrowableByteBuffer(self):
+        buf = GrowableByteBuffer.allocate(2)
+        buf.write(b'124')
+        buf.put_uint8(5)
+        buf.write(bytes(100))
+        self.assertEqual(len(buf), 104)
+        self.assertGreaterEqual(buf.capacity(), 104)
+        self.assertEqual(bytes(buf.getbuffer()[:4]), b'124\x05')
+        buf.set_pos(0)
+        self.assertEqual(bytes(buf.read(3)), b'124')
+        self.assertEqual(buf.remaining(), 101)
+        self.assertRaises(BufferError, buf.read, 102)
+
+    def test_create_growable_buf(self):
+        value = c_pdu.XDLMSAPDU(c_pdu.setRequest(c_pdu.setRequestNormal.from_str("10, (8, 00 00 01 00 00 ff, 2),,9:" + "01" * 300)))
+        buf = a_xdr.create_growable_buf(value)
+        self.assertEqual(bytes(buf)[14:17], bytes.fromhex("82 01 2c"))
+        buf2 = a_xdr.create_buf(value)
+        self.assertEqual(bytes(buf), bytes(buf2)[:len(buf)])
+        buf.set_pos(1)
+        self.assertEqual(bytes(c_pdu.SetRequest.get(buf).value[3].value), b'\x01' * 300)
+
+    def test_BufferPool(self):
+        pool = BufferPool()
+        value = c_pdu.XDLMSAPDU(c_pdu.getRequest(c_pdu.getRequestNormal.from_str("3, (7, 00 00 60 61 01 ff, 2), (1,5:0)")))
+        for _ in range(3):
+            buf = a_xdr.create_buf(value, pool)
+            self.assertEqual(bytes(buf), bytes(a_xdr.create_buf(value)))
+            pool.release(buf)
+        with pool.buffer(30) as buf1, pool.buffer(100) as buf2:
+            self.assertEqual((len(buf1), len(buf2)), (30, 100))
+        self.assertRaises(ValueError, pool.release, buf1)
+        print(pool.statistic)
+        self.assertEqual((pool.statistic.hits, pool.statistic.misses, pool.statistic.high_water, pool.statistic.in_use), (3, 2, 2, 0))
+
+    def test_checkpoint(self):
+        frame = bytes.fromhex("c4 01 c1 00 02 02 09 06 00 00 01 00 00 ff 12 00 09")
+        buf = ByteBuffer.wrap(frame[:-1])
+        buf.read(1)
+        with self.assertRaises(BufferError):
+            with buf.checkpoint():
+                c_pdu.Data.get(buf)
+        self.assertEqual((buf.get_pos(), buf.marks()), (1, 0), "rollback of partial frame")
+        buf = ByteBuffer.wrap(frame)
+        self.assertEqual(buf.mark(), 0)
+        self.assertEqual(buf.peek_uint8(), 0xc4)
+        value = c_pdu.XDLMSAPDU.get(buf)
+        self.assertEqual(buf.reset(), len(frame))
+        self.assertEqual(buf.get_pos(), 0)
+        buf.mark()
+        buf.read(4)
+        buf.mark()
+        self.assertIsInstance(c_pdu.Data.get(buf), c_pdu.Structure)
+        self.assertEqual(buf.reset(), len(frame) - 4, "nested")
+        self.assertEqual(buf.commit(), 4)
+        self.assertEqual((buf.get_pos(), buf.marks()), (4, 0))
+        with buf.checkpoint():
+            c_pdu.Data.get(buf)
+            buf.reset()
+        self.assertEqual(buf.get_pos(), 4, "reset inside without exception")
+        with buf.checkpoint():
+            c_pdu.Data.get(buf)
+        self.assertEqual((buf.remaining(), buf.marks()), (0, 0), "commit")
+        with self.assertRaises(BufferError):
+            buf.reset()
+        print(value)
+
+    def test_reserve(self):
+        buf = ByteBuffer.allocate(4)
+        buf.reserve(4)
+        buf.put_uint8_unchecked(1)
+        self.assertEqual(buf.put_unchecked(b'\x02\x03\x04'), 3)
+        with self.assertRaises(BufferError):
+            buf.reserve(1)
+        buf.set_pos(0)
+        buf.ensure(4)
+        self.assertEqual((buf.get_uint8_unchecked(), bytes(buf.read_unchecked(3))), (1, b'\x02\x03\x04'))
+        with self.assertRaises(BufferError):
+            buf.ensure(1)
+        buf.set_pos(0)
+        self.assertEqual((buf.skip(4), buf.get_pos()), (0, 4), "to end of buffer")
+        with self.assertRaises(BufferError):
+            buf.skip(1)
+        buf = GrowableByteBuffer.allocate(2)
+        buf.reserve(5)
+        buf.put_unchecked(b'12345')
+        self.assertEqual((len(buf), bytes(buf)), (5, b'12345'), "reserved is written")
@@ -0,0 +1,166 @@
+import unittest
+from timeit import timeit
+from src.COSEMpdu import compiler, a_xdr, main as c_pdu, asn1
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf, ScatterGatherBuffer
+
+
+def dump(value: asn1.Type) -> tuple:
+    """comparable view of decoded tree: classes and contents"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    match getattr(value, "value", None):
+        case tuple() as v:
+            return type(value), tuple(map(dump, v))
+        case asn1.Type() as v:
+            return type(value), dump(v)
+        case bytes() | bytearray() | memoryview() as v:
+            return type(value), bytes(v)
+        case v:
+            return type(value), v
+
+
+def profile_response(rows: int) -> bytes:
+    """GetResponseNormal with Array of Structure(DateTime, DoubleLongUnsigned x4, Unsigned)"""
+    row = bytes.fromhex("02 06 09 0c 07 e8 01 01 01 00 00 00 00 80 00 00"
+                        "06 00 00 00 01 06 00 00 00 02 06 00 00 00 03 06 00 00 00 04 11 07")
+    return bytes.fromhex("c4 01 81 00 01 82") + rows.to_bytes(2, "big") + row * rows
+
+
+FRAMES = (
+    '01 00 00 00 06 5F 1F 04 00 00 7E 1F 04 B0',
+    '01011000112233445566778899AABBCCDDEEFF0000065F1F0400007E1F04B0',
+    '08 00 06 5F 1F 04 00 00 50 1F 01 F4 00 07',
+    'C0010000080000010000FF020103010100',
+    'C4 01 81 00 02 02 0F FE 16 1B',
+    'c4 01 81 00 09 06 01 00 15 07 00 ff',
+    'c1 01 0a 00 08 00 00 01 00 00 ff 02 00 11 04 00',
+    '0d 02 00 01 04',
+    '0e 01 00 02',
+)
+
+
+class TestType(unittest.TestCase):
+    def check(self, data: bytes, type_: type[asn1.Type] = c_pdu.XDLMSAPDU):
+        buf1, buf2 = Buf.wrap(data), Buf.wrap(data)
+        value1 = type_.get(buf1)
+        value2 = compiler.decode(type_, buf2)
+        self.assertEqual(dump(value1), dump(value2), "compare with interpretive decode")
+        self.assertEqual(buf1.get_pos(), buf2.get_pos(), "compare position")
+
+    def test_frames(self):
+        for frame in FRAMES:
+            self.check(bytes.fromhex(frame))
+        self.check(profile_response(10))
+
+    def test_Data(self):
+        for data in ('00', '0301', '01020f010f02', '020309020102100102110a', '0401c0', '1a07e80101ff',
+                     '1301000302031011120f00ff000100030004ff000500ff0002', '130100001200'):
+            self.check(bytes.fromhex(data), c_pdu.Data)
+
+    def test_unknown_tag(self):
+        data = bytes.fromhex("c4 01 81 01 0a")
+        with self.assertRaises(ValueError) as e1:
+            c_pdu.XDLMSAPDU.get(Buf.wrap(data))
+        with self.assertRaises(ValueError) as e2:
+            compiler.decode(c_pdu.XDLMSAPDU, Buf.wrap(data))
+        self.assertEqual(str(e1.exception), str(e2.exception))
+
+    def test_unchecked(self):
+        frame = bytes.fromhex("c1 01 c1 00 01 00 00 63 01 00 ff 02 00 11 04")
+        self.check(frame)
+        for i in range(1, len(frame)):
+            with self.assertRaises(BufferError, msg=F"truncated to {i}"):
+                compiler.decode(c_pdu.XDLMSAPDU, Buf.wrap(frame[:i]))
+        source = compiler.get_source()
+        self.assertIn("buf.ensure(10)", source, "one check for invoke-id and descriptor")
+        data = bytes(range(256)) * 8
+
+        def checked():
+            buf = Buf.wrap(data)
+            for _ in range(1024):
+                buf.read(2)
+
+        def unchecked():
+            buf = Buf.wrap(data)
+            buf.ensure(2048)
+            for _ in range(1024):
+                buf.read_unchecked(2)
+
+        t1 = timeit(checked, number=100)
+        t2 = timeit(unchecked, number=100)
+        print(F"1024 fields: checked={t1:.4f}s, unchecked={t2:.4f}s, per field saving={(t1 - t2) / 102400 * 1e9:.0f}ns")
+
+    def test_encode_segments(self):
+        payload = bytes(range(256)) * 4096
+        frame = bytes.fromhex("c1 01 c1 00 01 00 00 63 01 00 ff 02 00 09 83 10 00 00") + payload
+        value = compiler.decode(c_pdu.XDLMSAPDU, Buf.wrap(frame))
+        segments = compiler.encode_segments(value)
+        print([len(s) for s in segments])
+        self.assertEqual(b"".join(segments), compiler.encode(value))
+        self.assertEqual(len(segments), 2)
+        self.assertIs(segments[1].obj, frame, "payload without copy")
+        self.assertEqual(len(b"".join(compiler.encode_segments(value, threshold=len(payload) + 1))), len(frame))
+        out = ScatterGatherBuffer(4)
+        out += b'\x01\x02'
+        start = len(out)
+        out += b'\x03' * 5
+        out.append(4)
+        self.assertEqual(len(out), 8)
+        out[start:start] = b'\x06'
+        out[0:0] = b'\x00'
+        self.assertEqual(b"".join(out.segments()), bytes.fromhex("00 01 02 06 03 03 03 03 03 04"), "insert before referenced")
+        with self.assertRaises(ValueError):
+            out[0] = 1
+        with self.assertRaises(ValueError):
+            out[5:5] = b'#'
+        with self.assertRaises(TypeError):
+            bytes(out)
+        out = ScatterGatherBuffer(4)
+        out += b'AAAA'
+        with self.assertRaises(ValueError):
+            out[1:1] = b'#'
+        out[4:4] = b'#'
+        self.assertEqual(b"".join(out.segments()), b'AAAA#')
+        t1 = timeit(lambda: compiler.encode(value), number=20)
+        t2 = timeit(lambda: compiler.encode_segments(value), number=20)
+        print(F"SetRequest with 1 MB OctetString: copy={t1:.4f}s, segments={t2:.4f}s, speedup={t1 / t2:.1f}")
+
+    def test_source(self):
+        compiler.compile_decoder(c_pdu.GetRequestNormal)
+        print(compiler.get_source()[:1000])
+
+    def test_benchmark(self):
+        data = profile_response(200)
+        decoder = compiler.compile_decoder(c_pdu.XDLMSAPDU)
+        t1 = timeit(lambda: c_pdu.XDLMSAPDU.get(Buf.wrap(data)), number=20)
+        t2 = timeit(lambda: decoder(Buf.wrap(data)), number=20)
+        print(F"GetResponse 200 rows: interpretive={t1:.4f}s, compiled={t2:.4f}s, speedup={t1 / t2:.2f}")
+
+    def check_encode(self, value: asn1.Type):
+        buf = Buf.allocate(1000)
+        value.put(buf)
+        self.assertEqual(bytes(buf.buf[:buf.get_pos()]), bytes(compiler.encode(value)), "compare with put")
+
+    def test_encode(self):
+        self.check_encode(c_pdu.XDLMSAPDU(c_pdu.getRequest(c_pdu.getRequestNormal.from_str("3, (7, 00 00 60 61 01 ff, 2), (1,5:0)"))))
+        self.check_encode(c_pdu.XDLMSAPDU(c_pdu.getRequest(c_pdu.getRequestWithList.from_str("1, ((7, 00 00 68 67 00 ff, 2),(2,5:0);(8, 00 00 01 00 00 ff, 3),)"))))
+        self.check_encode(c_pdu.XDLMSAPDU.from_str("195:1:1, (8, 00 00 01 00 00 ff, 3),"))
+        self.check_encode(c_pdu.XDLMSAPDU(c_pdu.initiateRequest.from_str("01 ,0,, 6, 101001100100110010101101, 128")))
+        self.check_encode(c_pdu.XDLMSAPDU(c_pdu.ReadResponse_((c_pdu.Data_.default(), c_pdu.Data_.default()))))
+        self.check_encode(c_pdu.Data.from_str("1: 5:4; 5:2; 9:31 32 33"))
+        self.check_encode(a_xdr.NullType())
+        for frame in FRAMES:
+            self.check_encode(c_pdu.XDLMSAPDU.get(Buf.wrap(bytes.fromhex(frame))))
+
+    def test_encode_long_length(self):
+        value = c_pdu.OctetString(bytes(300))
+        self.assertEqual(compiler.encode(value)[:4], bytes.fromhex("09 82 01 2c"))
+        buf = compiler.create_buf(c_pdu.Data(value))
+        self.assertEqual(bytes(c_pdu.Data.get(buf).value), bytes(300))
+
+    def test_encode_benchmark(self):
+        value = c_pdu.XDLMSAPDU.get(Buf.wrap(profile_response(100)))
+        encoder = compiler.compile_encoder(type(value))
+        t1 = timeit(lambda: a_xdr.create_buf(value), number=20)
+        t2 = timeit(lambda: encoder(value, bytearray()), number=20)
+        print(F"encode 100 rows: create_buf={t1:.4f}s, compiled={t2:.4f}s, speedup={t1 / t2:.2f}")
@@ -0,0 +1,38 @@
+import unittest
+from src.COSEMpdu import main as c_pdu
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from src.COSEMpdu.lazy import LazyData
+from test_compiler import dump, profile_response
+
+
+class TestType(unittest.TestCase):
+    def test_profile(self):
+        buf = Buf.wrap(profile_response(100))
+        buf.read(4)
+        value = LazyData.get(buf)
+        self.assertEqual(buf.remaining(), 0, "skip all Data")
+        print(value, value[0], value[-1][0])
+        self.assertEqual(len(value), 100)
+        self.assertEqual(len(value[99]), 6)
+        self.assertEqual(bytes(value[-1][4].value), bytes.fromhex("00 00 00 04"))
+        self.assertIsInstance(value[5][0], c_pdu.OctetString)
+        eager = c_pdu.Data.get(Buf(memoryview(profile_response(100))[4:]))
+        self.assertEqual(dump(value.materialize()), dump(eager))
+        self.assertEqual(dump(c_pdu.Structure(tuple(value[7]))), dump(eager.value[7]))
+
+    def test_Data(self):
+        for data in ('00', '0301', '01020f010f02', '020309020102100102110a', '0401c0', '0a0161', '1a07e80101ff'):
+            buf = Buf.wrap(bytes.fromhex(data) + b'\xff')
+            value = LazyData.get(buf)
+            self.assertEqual(buf.get_pos(), len(data) // 2)
+            self.assertEqual(dump(value.materialize()), dump(c_pdu.Data.get(Buf.wrap(bytes.fromhex(data)))))
+        with self.assertRaises(TypeError):
+            len(LazyData(memoryview(bytes.fromhex("0301"))))
+        with self.assertRaises(IndexError):
+            LazyData(memoryview(bytes.fromhex("01020f010f02")))[2]
+        with self.assertRaises(ValueError):
+            LazyData(memoryview(bytes.fromhex("0701")))
+        value = LazyData(memoryview(bytes.fromhex("01 02 11 01 07 01")))
+        self.assertEqual(int(value[0]), 1)
+        with self.assertRaises(ValueError):
+            value[1]
@@ -1,7 +1,9 @@
 import unittest
+from timeit import timeit
+import tracemalloc
 from typing import Type
-from src.COSEMpdu import a_xdr, main as c_pdu, asn1
-from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from src.COSEMpdu import a_xdr, main as c_pdu, asn1, compiler
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf, DetachingByteBuffer as DetachingBuf
 
 
 class TestType(unittest.TestCase):
@@ -14,6 +16,58 @@ class TestType(unittest.TestCase):
         conf2 = c_pdu.Conformance.get(buf)
         self.assertEqual(conf1, conf2, "put-get check")
 
+    def test_BitString_ops(self):
+        for t in (c_pdu.BitString, c_pdu.Conformance):
+            value = t.from_str("1001011001")
+            self.assertEqual((value.bit_len(), value.to_int(), value.popcount()), (10, 0b1001011001, 5))
+            self.assertEqual((value[0], value[1], value[-1]), (1, 0, 1))
+            self.assertEqual(value[2:5], [0, 1, 0])
+            with self.assertRaises(IndexError):
+                value[10]
+            value[1] = 1
+            value.inverse(0)
+            self.assertEqual(value.to_str(), "0101011001")
+            value << 3
+            self.assertEqual(value.to_str(), "1011001010")
+            value >> 13
+            self.assertEqual(value.to_str(), "0101011001")
+            self.assertEqual((value & t.from_str("1100000001")).to_str(), "0100000001")
+            self.assertEqual((value | t.from_str("1000000000")).to_str(), "1101011001")
+            with self.assertRaises(ValueError):
+                value & t.from_str("1")
+            value.clear()
+            self.assertEqual((value.to_str(), value.popcount()), ("0000000000", 0))
+        proposed = c_pdu.Conformance.from_str("000000000001111000011101")
+        supported = c_pdu.Conformance.from_str("000000000001101000011111")
+        negotiated = proposed & supported
+        self.assertEqual(bytes(negotiated.value), bytes.fromhex("00 00 1a 1d"))
+        conf = c_pdu.Conformance.get(Buf.wrap(bytes.fromhex("5f 1f 04 00 00 1e 1d")))
+        self.assertEqual((conf[19], conf[20], conf[22]), (1, 1, 0), "get, set, event-notification")
+        value = c_pdu.BitString.get(Buf.wrap(bytes.fromhex("04 0a ff ff")))
+        self.assertEqual(value.to_str(), "1" * 10, "ignore unused bits")
+        value[9] = 0
+        self.assertEqual(a_xdr.create_buf(value).buf.hex(" "), "04 0a ff bf")
+        data = bytearray.fromhex("04 10 00 00")
+        value = c_pdu.BitString.get(Buf(memoryview(data)))
+        value[0] = 1
+        content = value.content
+        value.inverse(15)
+        self.assertIs(value.content, content, "set bit in place")
+        self.assertEqual((value.to_str(), data.hex(" ")), ("1000000000000001", "04 10 00 00"), "source not changed")
+        conf.inverse(0)
+        self.assertEqual((conf[0], bytes(conf.value)), (1, bytes.fromhex("00 80 1e 1d")))
+
+    def test_Choice_TAGS(self):
+        for name in dir(c_pdu):
+            cls = getattr(c_pdu, name)
+            if isinstance(cls, type) and issubclass(cls, a_xdr.Choice):
+                for n_t in cls.get_elements():
+                    if isinstance(n_t, type):
+                        self.assertIs(cls.TAGS[int(n_t.Tag)], n_t, F"{cls.__name__} tag table")
+        buf = Buf(memoryview(b'\x11\x05'))
+        self.assertIsInstance(c_pdu.Data.get(buf), c_pdu.Unsigned)
+        self.assertRaises(ValueError, c_pdu.Data.get, Buf(memoryview(b'\x07\x05')))
+
     def test_NullData(self):
         value = c_pdu.NullData.default()
         buf = Buf.allocate(10)
@@ -102,6 +156,183 @@ class TestType(unittest.TestCase):
         self.check_with_buf('01020f010f02', c_pdu.Data)
         self.check_with_buf('01030f010f020f03', c_pdu.Data)
 
+    def test_get_Data_length(self):
+        for value in ('00', '0301', '01020f010f02', '020309020102100102110a', '0401c0', '0a0161', '1a07e80101ff',
+                      '0981800a' + '00' * 0x80 + '0a'):
+            data = bytes.fromhex(value)
+            c_pdu.Data.get(buf := Buf.wrap(data + b'\xff'))
+            self.assertEqual(c_pdu.get_Data_length(Buf.wrap(data + b'\xff')), buf.get_pos(), value)
+        with self.assertRaises(BufferError):
+            c_pdu.get_Data_length(Buf.wrap(bytes.fromhex('0102110a12')))
+        with self.assertRaises(ValueError):
+            c_pdu.get_Data_length(Buf.wrap(bytes.fromhex('0701')))
+        with self.assertRaises(ValueError):
+            c_pdu.get_Data_length(Buf.wrap(bytes.fromhex('13de010003')))
+
+    def test_get_Data_offsets(self):
+        row = bytes.fromhex("02 03 09 02 01 02 06 00 00 00 00 11 07")
+        buf = Buf.wrap(bytes.fromhex("00 01 81 c8") + row * 200)
+        offsets = c_pdu.get_Data_offsets(buf, 1)
+        self.assertEqual(len(offsets), 201)
+        self.assertEqual(offsets[-1], len(buf))
+        buf.set_pos(offsets[150])
+        self.assertEqual(str(c_pdu.Data.get(buf)), str(c_pdu.Data.get(Buf.wrap(row))))
+        with self.assertRaises(TypeError):
+            c_pdu.get_Data_offsets(Buf.wrap(bytes.fromhex('0301')))
+
+    def test_get_Data(self):
+        for value in ('00', '0301', '01020f010f02', '020309020102100102110a', '0401c0', '0a0161', '1a07e80101ff',
+                      '0100', '0981800a' + '00' * 0x80, '0102020210ffff1604020009060000010000ff'):
+            buf1, buf2 = Buf.wrap(bytes.fromhex(value) + b'\xff'), Buf.wrap(bytes.fromhex(value) + b'\xff')
+            value1, value2 = c_pdu.Data.get(buf1), c_pdu.get_Data(buf2)
+            self.assertEqual((type(value1), str(value1)), (type(value2), str(value2)), value)
+            self.assertEqual(buf1.get_pos(), buf2.get_pos())
+        with self.assertRaises(BufferError):
+            c_pdu.get_Data(Buf.wrap(bytes.fromhex('0102110a12')))
+        with self.assertRaises(BufferError):
+            c_pdu.get_Data(Buf.wrap(bytes.fromhex('0102110a0a0561')))
+        deep = bytes.fromhex('0101') * 5000 + bytes.fromhex('00')
+        with self.assertRaises(RecursionError):
+            c_pdu.Data.get(Buf.wrap(deep))
+        self.assertIsInstance(c_pdu.get_Data(Buf.wrap(deep)), c_pdu.Array)
+
+    def test_get_Data_benchmark(self):
+        register = bytes.fromhex("02 03 12 00 03 09 06 01 00 01 08 00 ff 02 02 0f fe 16 1e")
+        table = bytes.fromhex("01 81 64") + (bytes.fromhex("02 02 01 02") + register * 2 + bytes.fromhex("11 01")) * 100
+        t1 = timeit(lambda: c_pdu.Data.get(Buf.wrap(table)), number=20)
+        t2 = timeit(lambda: c_pdu.get_Data(Buf.wrap(table)), number=20)
+        print(F"nested register table: recursive={t1:.4f}s, iterative={t2:.4f}s, speedup={t1 / t2:.2f}")
+
+    def test_intern(self):
+        self.assertIs(c_pdu.Unsigned8.get(Buf.wrap(b'\x05')), c_pdu.Unsigned8.get(Buf.wrap(b'\x05')))
+        self.assertIs(a_xdr.BooleanType.get(Buf.wrap(b'\x01')), a_xdr.TRUE)
+        self.assertIs(c_pdu.Data.get(Buf.wrap(b'\x00')), c_pdu.NULL_DATA)
+        self.assertIsNot(c_pdu.Unsigned.get(Buf.wrap(b'\x11\x05')), c_pdu.Unsigned8.get(Buf.wrap(b'\x05')), "table by class")
+        enum = bytes.fromhex("01 02 16 03 16 03")
+        for decode in (c_pdu.Data.get, c_pdu.get_Data, compiler.compile_decoder(c_pdu.Data)):
+            value = decode(Buf.wrap(enum))
+            self.assertIs(value.value[0], value.value[1])
+            self.assertIsInstance(value.value[0].value, bytes, "not keep source buffer")
+        for decode, data in ((c_pdu.DataAccessResult.get, b'\x03'), (c_pdu.Data.get, b'\x11\x05'), (a_xdr.BooleanType.get, b'\x01')):
+            value = decode(Buf.wrap(data))
+            with self.assertRaises(AttributeError):
+                value.value = b'\x00'
+            self.assertEqual(a_xdr.create_buf(decode(Buf.wrap(data))).buf.tobytes()[-1:], data[-1:], "next decode not changed")
+        value = c_pdu.Unsigned8(b'\x05')
+        value.value = b'\x06'
+        self.assertEqual(int(value), 6, "fresh instance is mutable")
+        # realistic GetResponseWithList: register values with scaler_unit and status
+        results = (bytes.fromhex("00 02 02 06 00 00 01 00 02 02 0f fe 16 1e") + bytes.fromhex("00 02 02 11 00 03 01")) * 500
+        frame = bytes.fromhex("c4 03 c1 82 03 e8") + results
+        c_pdu.XDLMSAPDU.get(Buf.wrap(frame))
+        tracemalloc.start()
+        value = c_pdu.XDLMSAPDU.get(Buf.wrap(frame))
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results = value.result.value
+        leaf = results[1].value[0]
+        not_interned = 2000 * (leaf.__sizeof__() + memoryview(b'').__sizeof__())
+        print(F"GetResponseWithList[1000]: {size} bytes retained, without interning 2000 1-octet leafs need additional {not_interned}")
+        self.assertIs(leaf, results[3].value[0])
+        self.assertIs(results[0].value[1].value[1], results[2].value[1].value[1], "scaler_unit unit")
+
+    def test_detach(self):
+        frame = bytes.fromhex("c4 01 c1 00 02 05 09 06 00 00 01 00 00 ff 06 00 00 00 2a 04 03 a0 12 00 09 09 02 01 02")
+        for decode in (c_pdu.XDLMSAPDU.get, c_pdu.get_Data, compiler.compile_decoder(c_pdu.XDLMSAPDU)):
+            pos = 0 if decode is not c_pdu.get_Data else 4
+            data = bytearray(frame)
+            value = decode(Buf(memoryview(data)[pos:]))
+            with self.assertRaises(BufferError):
+                data.extend(b'\x00')
+            data = bytearray(frame)
+            value2 = decode(buf := DetachingBuf(memoryview(data)[pos:]))
+            self.assertEqual(buf.remaining(), 0)
+            del buf
+            data.extend(b'\x00')
+            self.assertEqual(compiler.encode(value2), compiler.encode(value), "copy equal to view")
+        value = c_pdu.XDLMSAPDU.get(Buf(memoryview(data := bytearray(frame))))
+        self.assertIs(asn1.detach(value), value)
+        data.extend(b'\x00')
+        print(value, value.result.value[0].value)
+        self.assertEqual(int(value.result.value[1]), 42)
+
+    def test_FixedInteger(self):
+        for t in (c_pdu.Integer8, c_pdu.Integer16, c_pdu.Integer32, c_pdu.Integer64,
+                  c_pdu.Unsigned8, c_pdu.Unsigned16, c_pdu.Unsigned32, c_pdu.Unsigned64):
+            bits = t.Size * 8
+            limits = (-(1 << bits - 1), (1 << bits - 1) - 1) if t.SIGNED() else (0, (1 << bits) - 1)
+            for i in limits:
+                value = t.from_int(i)
+                self.assertEqual(int(value), i)
+                self.assertEqual(bytes(value.value), i.to_bytes(t.Size, "big", signed=t.SIGNED()))
+                self.assertEqual(int(value), asn1.Digital.__int__(value), "same as generic")
+            with self.assertRaises(OverflowError):
+                t.from_int(limits[1] + 1)
+            with self.assertRaises(ValueError) as e:
+                int(t(bytes(t.Size + 1)))
+            self.assertEqual(str(e.exception), F"{t.__name__} has value with length {t.Size + 1}, expected {t.Size}")
+            buf = Buf.allocate(4 * t.Size)
+            self.assertEqual(t.put_int(buf, limits[0]), t.Size)
+            self.assertEqual(t.put_ints(buf, limits + limits[:1]), 3 * t.Size)
+            buf.set_pos(0)
+            self.assertEqual(t.get_int(buf), limits[0])
+            self.assertEqual(t.get_ints(buf, 3), limits + limits[:1])
+            with self.assertRaises(BufferError):
+                t.get_int(buf)
+        buf = Buf.wrap(bytes.fromhex("00 01 00 02 00 03"))
+        self.assertEqual(c_pdu.Unsigned16.get_ints(buf, 3), (1, 2, 3))
+        value = c_pdu.Long64Unsigned.get(Buf.wrap(bytes.fromhex("15 00 00 00 00 00 00 01 00")))
+        self.assertEqual(int(value), 256)
+
+    def test_Numeric(self):
+        buf = Buf.wrap(bytes.fromhex("00 08 00 03 00 08 00 01"))
+        values = [c_pdu.CosemClassId.get(buf) for _ in range(4)]
+        self.assertEqual(sorted(values), [1, 3, 8, 8])
+        self.assertEqual(len(set(values)), 3, "dedupe by hash")
+        self.assertEqual({values[0]: 1}[values[2]], 1)
+        self.assertTrue(values[0] >= values[2] > values[1] > values[3])
+        self.assertEqual(values[0]._int, 8, "cached by first int()")
+        self.assertEqual(c_pdu.Integer16.from_int(-2)._int, -2, "cached by constructor")
+        results = [c_pdu.DataAccessResult.get(Buf.wrap(bytes((i,)))) for i in (250, 0, 3, 0)]
+        self.assertEqual(sorted(results), [0, 0, 3, 250])
+        self.assertEqual(len(set(results)), 3)
+        with self.assertRaises(TypeError):
+            values[0] < "1"
+        value = c_pdu.CosemClassId.from_int(7)
+        value.value = b'\x00\x09'
+        self.assertEqual((int(value), hash(value)), (9, 9), "cache reset by assignment")
+        self.assertTrue(value > c_pdu.CosemClassId.from_int(8))
+        self.assertEqual(value, c_pdu.CosemClassId.from_int(9))
+        value = c_pdu.DataAccessResult(b'\x03')
+        int(value)
+        value.value = b'\x04'
+        self.assertEqual(int(value), 4)
+
+    def test_CompactArray(self):
+        data = bytes.fromhex("13 01 00 03 06 0c 00 00 00 01 00 00 00 02 00 00 00 03")
+        value = c_pdu.Data.get(Buf.wrap(data))
+        self.assertIsInstance(value, c_pdu.CompactArray)
+        self.assertIsInstance(value.contents_description, c_pdu.arrayDescription)
+        array = value.get_array()
+        print(value, array)
+        self.assertEqual([int(el) for el in array.value], [1, 2, 3])
+        self.assertEqual(bytes(a_xdr.create_buf(c_pdu.CompactArray.from_array(array)).buf), data)
+        self.assertEqual(c_pdu.get_Data_length(Buf.wrap(data + b'\x00')), len(data))
+        self.assertIsInstance(c_pdu.get_Data(Buf.wrap(data)), c_pdu.CompactArray)
+        self.check_with_buf("13 01 00 02 02 02 01 00 02 11 12 08 01 02 03 04 05 06 07 08", c_pdu.Data)
+        value = c_pdu.CompactArray.from_columns((c_pdu.DoubleLongUnsigned, c_pdu.Long, c_pdu.OctetString),
+                                                ([1, 2], [-1, 3], [b'ab', b'c']))
+        self.assertEqual(a_xdr.create_buf(value).buf.hex(" "), "13 01 00 02 02 03 06 10 09 11 00 00 00 01 ff ff 02 61 62 00 00 00 02 00 03 01 63")
+        self.assertEqual(str(value.get_array()), str(c_pdu.Data.get(Buf.wrap(bytes.fromhex(
+            "01 02 02 03 06 00 00 00 01 10 ff ff 09 02 61 62 02 03 06 00 00 00 02 10 00 03 09 01 63")))))
+        structure = c_pdu.Data.get(Buf.wrap(bytes.fromhex("01 02 02 02 11 01 12 00 02 02 02 11 01 11 02")))
+        with self.assertRaises(ValueError):
+            c_pdu.CompactArray.from_array(structure)
+        with self.assertRaises(ValueError):
+            c_pdu.CompactArray.from_columns((c_pdu.Long, c_pdu.Long), ([1, 2], [3]))
+        with self.assertRaises(ValueError):
+            c_pdu.Data.get(Buf.wrap(bytes.fromhex("13 01 00 01 11 02 01 02"))).get_array()
+
     def check_with_buf(self, value: str, type_: Type[asn1.Type]):
         data = bytes.fromhex(value)
         input_buf = Buf(memoryview(data))
@@ -152,6 +383,33 @@ class TestType(unittest.TestCase):
         print(value, buf.buf.hex(" "))
         self.assertEqual(buf.buf, bytes.fromhex("c0 01 03 00 07 00 00 60 61 01 ff 02 01 01 05 00 00 00 00 00"), "generate with selection")
 
+    def test_accessors(self):
+        class Wide(a_xdr.SequenceType):
+            __annotations__ = {F"f{i}": c_pdu.Unsigned8 for i in range(12)}
+
+            def __init__(self, value):
+                super().__init__(value)
+
+            @classmethod
+            def from_elements(cls, *elements):
+                return cls(elements)
+
+        value = Wide.from_str(", ".join(map(str, range(12))))
+        print(value, Wide.f11.__doc__)
+        self.assertEqual([int(getattr(value, F"f{i}")) for i in range(12)], list(range(12)), "more than 10 elements")
+        self.assertIs(Wide.f2, c_pdu.getRequestNormal.access_selection, "accessor common by index")
+        request = c_pdu.getRequestNormal.from_str("3, (8, 00 00 01 00 01 ff, 2),")
+        invoke_id, descriptor, access = request
+        class_id, instance_id, attribute_id = descriptor
+        self.assertIs(invoke_id, request.invoke_id_and_priority)
+        self.assertIs(access, request.access_selection)
+        self.assertEqual((int(class_id), int(attribute_id)), (8, 2))
+        match descriptor:
+            case c_pdu.CosemAttributeDescriptor(c_pdu.CosemClassId() as c, _, a):
+                self.assertEqual((int(c), int(a)), (8, 2))
+            case _:
+                self.fail("match by positional elements")
+
     def test_getRequestWithList(self):
         value = c_pdu.XDLMSAPDU(c_pdu.getRequest(c_pdu.getRequestWithList.from_str("1, ((7, 00 00 68 67 00 ff, 2),(2,5:0);(8, 00 00 01 00 00 ff, 3),)")))
         buf = a_xdr.create_buf(value)
@@ -0,0 +1,100 @@
+import unittest
+from timeit import timeit
+from src.COSEMpdu import a_xdr, main as c_pdu, native
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from test_compiler import FRAMES, profile_response
+
+
+class TestType(unittest.TestCase):
+    def check(self, data: bytes):
+        buf1, buf2 = Buf.wrap(data), Buf.wrap(data)
+        value = native.get_Data(buf1)
+        self.assertEqual(value, native.to_python(c_pdu.Data.get(buf2)), "compare with get-then-convert")
+        self.assertEqual(buf1.get_pos(), buf2.get_pos())
+        return value
+
+    def test_Data(self):
+        self.assertEqual(self.check(bytes.fromhex("00")), None)
+        self.assertEqual(self.check(bytes.fromhex("0301")), True)
+        self.assertEqual(self.check(bytes.fromhex("10ff85")), -123)
+        self.assertEqual(self.check(bytes.fromhex("15ffffffffffffffff")), 0xffffffffffffffff)
+        self.assertEqual(self.check(bytes.fromhex("173fc00000")), 1.5)
+        self.assertEqual(self.check(bytes.fromhex("18bff8000000000000")), -1.5)
+        self.assertEqual(self.check(bytes.fromhex("090401020304")), b'\x01\x02\x03\x04')
+        self.assertEqual(self.check(bytes.fromhex("0c03d0b661")), "жa")
+        self.assertEqual(self.check(bytes.fromhex("0409a5c0")), "101001011")
+        self.assertEqual(self.check(bytes.fromhex("01020f010f02")), [1, 2])
+        self.assertEqual(self.check(bytes.fromhex("020309020102100102110a")), (b'\x01\x02', 258, 10))
+        self.assertEqual(self.check(bytes.fromhex("0100")), [])
+        self.assertEqual(self.check(bytes.fromhex("13 01 00 02 02 02 01 00 02 11 12 08 01 02 03 04 05 06 07 08")),
+                         [([1, 2], 0x0304), ([5, 6], 0x0708)])
+        self.check(profile_response(3)[4:])
+        with self.assertRaises(BufferError):
+            native.get_Data(Buf.wrap(bytes.fromhex("0102110a12")))
+
+    def test_get(self):
+        value = native.get(c_pdu.XDLMSAPDU, Buf.wrap(profile_response(2)))
+        print(value)
+        self.assertEqual(value[0], 196)
+        self.assertEqual(value[1][0], 1)
+        invoke_id, (tag, data) = value[1][1]
+        self.assertEqual((invoke_id, tag), (0x81, 0))
+        self.assertEqual(data[1][1:], (1, 2, 3, 4, 7))
+        for frame in FRAMES:
+            print(native.get(c_pdu.XDLMSAPDU, Buf.wrap(bytes.fromhex(frame))))
+
+    def test_benchmark(self):
+        data = memoryview(profile_response(1000))[4:]
+        t1 = timeit(lambda: native.to_python(c_pdu.Data.get(Buf(data))), number=5)
+        t2 = timeit(lambda: native.get_Data(Buf(data)), number=5)
+        print(F"profile 1000 rows to python: get-then-convert={t1:.4f}s, native={t2:.4f}s, speedup={t1 / t2:.2f}")
+
+    def check_put(self, hint, value, data: str):
+        buf = native.create_buf(hint, value)
+        self.assertEqual(bytes(buf).hex(" "), data)
+        return buf
+
+    def test_put(self):
+        self.check_put(c_pdu.DoubleLongUnsigned, 1, "06 00 00 00 01")
+        self.check_put(c_pdu.Long, -2, "10 ff fe")
+        self.check_put(c_pdu.Float32, 1.5, "17 3f c0 00 00")
+        self.check_put(c_pdu.Boolean, True, "03 01")
+        self.check_put(c_pdu.NullData, None, "00")
+        self.check_put(c_pdu.OctetString, b'\x01\x02', "09 02 01 02")
+        self.check_put(c_pdu.UTF8string, "жa", "0c 03 d0 b6 61")
+        self.check_put(c_pdu.BitString, "101001011", "04 09 a5 80")
+        self.check_put([c_pdu.Unsigned], [1, 2], "01 02 11 01 11 02")
+        self.check_put((c_pdu.Unsigned,), (5,), "02 01 11 05")
+        self.check_put([(c_pdu.Unsigned,)], [(5,)], "01 01 02 01 11 05")
+        description = c_pdu.get_type_description(c_pdu.Data.get(Buf.wrap(bytes.fromhex("02 01 11 00"))))
+        self.check_put(description, (5,), "02 01 11 05")
+        self.check_put((c_pdu.OctetString, [c_pdu.LongUnsigned]), (b'\xff', [258]), "02 02 09 01 ff 01 01 12 01 02")
+        description = c_pdu.get_type_description(c_pdu.Data.get(Buf.wrap(bytes.fromhex("01 01 02 02 11 00 10 00 00"))))
+        buf = self.check_put(description, [(5, -1)], "01 01 02 02 11 05 10 ff ff")
+        self.assertEqual(native.get_Data(buf), [(5, -1)])
+        with self.assertRaises(ValueError):
+            native.create_buf(description, [(5, -1), (6, 1)])
+        with self.assertRaises(ValueError):
+            native.create_buf((c_pdu.Long, c_pdu.Long), (1,))
+        with self.assertRaises(TypeError):
+            native.create_buf(1, 1)
+
+    def test_put_schema(self):
+        for frame in FRAMES[:3]:
+            data = bytes.fromhex(frame)
+            value = native.get(c_pdu.XDLMSAPDU, buf := Buf.wrap(data))
+            self.assertEqual(bytes(native.create_buf(c_pdu.XDLMSAPDU, value)), data[:buf.get_pos()], frame)
+        value = (192, (1, (0x81, (8, bytes.fromhex("00 00 01 00 00 ff"), 2), (1, (c_pdu.Date, bytes(5))))))
+        self.check_put(c_pdu.XDLMSAPDU, value, "c0 01 81 00 08 00 00 01 00 00 ff 02 01 01 1a 00 00 00 00 00")
+
+    def test_put_benchmark(self):
+        hint = [(c_pdu.OctetString, c_pdu.LongUnsigned, c_pdu.Unsigned)]
+        values = [(bytes(6), i, i % 4) for i in range(1000)]
+
+        def build():
+            return a_xdr.create_growable_buf(c_pdu.Array(tuple(c_pdu.Structure((
+                c_pdu.OctetString(v[0]), c_pdu.LongUnsigned.from_int(v[1]), c_pdu.Unsigned.from_int(v[2]))) for v in values)))
+        self.assertEqual(bytes(build()), bytes(native.create_buf(hint, values)))
+        t1 = timeit(build, number=5)
+        t2 = timeit(lambda: native.create_buf(hint, values), number=5)
+        print(F"table 1000 entries: objects+put={t1:.4f}s, native={t2:.4f}s, speedup={t1 / t2:.2f}")
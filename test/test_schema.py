@@ -0,0 +1,42 @@
+import unittest
+from src.COSEMpdu import schema, main as c_pdu, a_xdr
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+
+
+class TestType(unittest.TestCase):
+    def test_get_schema(self):
+        s = schema.get_schema(c_pdu.getRequestNormal)
+        print(s)
+        self.assertEqual(s.names, ("invoke_id_and_priority", "cosem_attribute_descriptor", "access_selection"))
+        self.assertEqual(s.elements, (c_pdu.InvokeIdAndPriority, c_pdu.CosemAttributeDescriptor, c_pdu.SelectiveAccessDescriptorOptional))
+        self.assertEqual((s.min_size, s.max_size), (1 + 1 + 9 + 1, None))
+        self.assertIs(schema.get_schema(c_pdu.getRequestNormal), s, "built once")
+        s = schema.get_schema(c_pdu.CosemAttributeDescriptor)
+        self.assertEqual((s.min_size, s.max_size), (9, 9))
+        s = schema.get_schema(c_pdu.Data)
+        self.assertIs(s.tags[17], c_pdu.Unsigned)
+        self.assertIn(c_pdu.CompactArray, s.elements)
+        self.assertEqual((s.min_size, s.max_size), (1, None))
+        with self.assertRaises(TypeError):
+            s.tags[100] = c_pdu.Unsigned
+        s = schema.get_schema(c_pdu.Structure)
+        self.assertEqual((s.names, s.elements, s.min_size), ((), (c_pdu.Data,), 2))
+        s = schema.get_schema(c_pdu.Unsigned16)
+        self.assertEqual((s.size, s.min_size, s.max_size), (2, 2, 2))
+        s = schema.get_schema(c_pdu.SelectiveAccessDescriptorOptional)
+        self.assertEqual(s.min_size, 1, "absent")
+
+    def test_get_schemas(self):
+        schemas = schema.get_schemas()
+        print(len(schemas))
+        for name, s in schemas.items():
+            if s.max_size is not None:
+                self.assertLessEqual(s.min_size, s.max_size, name)
+        value = c_pdu.XDLMSAPDU.get(Buf.wrap(bytes.fromhex("c0 01 c1 00 08 00 00 01 00 00 ff 02 00")))
+        s = schemas["getRequestNormal"]
+        self.assertLessEqual(s.min_size, len(a_xdr.create_buf(value)))
+
+    def test_FIELDS(self):
+        self.assertEqual(c_pdu.GetRequestNormal.FIELDS, tuple(c_pdu.GetRequestNormal.__annotations__.values()))
+        self.assertEqual(c_pdu.Structure.FIELDS, ())
+        self.assertIsNotNone(c_pdu.GetResponse.ELEMENTS, "built with class creation")
@@ -0,0 +1,71 @@
+import unittest
+from src.COSEMpdu import compiler, main as c_pdu
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from src.COSEMpdu.stream import StreamDecoder
+from test_compiler import FRAMES, profile_response
+
+
+def get_frames() -> list[bytes]:
+    """FRAMES without trailing bytes"""
+    ret = list()
+    for frame in FRAMES:
+        c_pdu.XDLMSAPDU.get(buf := Buf.wrap(bytes.fromhex(frame)))
+        ret.append(bytes(buf.buf[:buf.get_pos()]))
+    return ret
+
+
+class TestType(unittest.TestCase):
+    def check(self, decoded: list, frames: list[bytes]):
+        self.assertEqual(len(decoded), len(frames))
+        for value, frame in zip(decoded, frames):
+            self.assertEqual(compiler.encode(value), compiler.encode(c_pdu.XDLMSAPDU.get(Buf.wrap(frame))))
+
+    def test_split(self):
+        frames = get_frames() + [profile_response(3)]
+        stream = b''.join(frames)
+        for size in (1, 2, 3, 7, 100, len(stream)):
+            d = StreamDecoder()
+            decoded = list()
+            for i in range(0, len(stream), size):
+                decoded.extend(d.feed(stream[i: i + size]))
+            self.check(decoded, frames)
+            self.assertEqual(len(d), 0, "no partial frame")
+
+    def test_every_border(self):
+        frame = profile_response(2)
+        for i in range(len(frame)):
+            d = StreamDecoder(decoder=compiler.compile_decoder(c_pdu.XDLMSAPDU))
+            self.assertEqual(d.feed(frame[:i]), [])
+            self.assertEqual(len(d), i)
+            self.check(d.feed(frame[i:] + frame), [frame, frame])
+
+    def test_one_chunk(self):
+        frames = (get_frames() + [profile_response(3)]) * 20
+        d = StreamDecoder()
+        self.check(d.feed(b''.join(frames) + frames[0][:3]), frames)
+        self.assertEqual(len(d), 3, "rest of chunk kept for next frame")
+        self.check(d.feed(frames[0][3:]), frames[:1])
+        frame = bytes.fromhex("c4 01 81 00 00")
+        """ ended by NullData """
+        for i in range(len(frame) + 1):
+            d = StreamDecoder()
+            self.check(d.feed(frame[:i]) + d.feed(frame[i:]), [frame])
+
+    def test_long_string(self):
+        frame = bytes.fromhex("c4 01 81 00 09 82 01 2c") + bytes(300)
+        d = StreamDecoder()
+        self.assertEqual(d.feed(frame[:6]), [])
+        self.assertEqual(d.feed(frame[6:200]), [])
+        value, = d.feed(frame[200:])
+        print(value)
+        self.check([value], [frame])
+
+    def test_error(self):
+        d = StreamDecoder()
+        with self.assertRaises(ValueError) as e:
+            d.feed(bytes.fromhex("c4 01 81 01 0a"))
+        with self.assertRaises(ValueError) as e2:
+            c_pdu.XDLMSAPDU.get(Buf.wrap(bytes.fromhex("c4 01 81 01 0a 00")))
+        self.assertEqual(str(e.exception), str(e2.exception))
+        d.reset()
+        self.check(d.feed(bytes.fromhex(FRAMES[4])), [bytes.fromhex(FRAMES[4])])
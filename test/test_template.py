@@ -0,0 +1,69 @@
+import unittest
+from src.COSEMpdu import main as c_pdu
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from src.COSEMpdu.template import Template
+
+RANGE_REQUEST = bytes.fromhex(
+    "c0 01 c1 00 07 01 00 63 01 00 ff 02 01 01 02 04 02 04 12 00 08 09 06 00 00 01 00 00 ff 0f 02 12 00 00"
+    "09 0c 07 ea 0a 12 ff 00 00 00 00 80 00 00 09 0c 07 ea 0a 13 ff 00 00 00 00 80 00 00 01 00")
+"""GetRequestNormal of Profile generic buffer with range descriptor"""
+
+
+def range_request() -> tuple[c_pdu.XDLMSAPDU, c_pdu.getRequestNormal]:
+    request = c_pdu.XDLMSAPDU.get(Buf.wrap(RANGE_REQUEST))
+    return c_pdu.XDLMSAPDU(c_pdu.getRequest(request)), request
+
+
+class TestType(unittest.TestCase):
+    def test_create(self):
+        value, request = range_request()
+        _, from_value, to_value, _ = request.access_selection.access_parameters.value
+        t = Template(value, invoke_id=request.invoke_id_and_priority, from_value=from_value, to_value=to_value)
+        print({name: (f.start, f.size) for name, f in t.fields.items()})
+        self.assertEqual(t.frame, RANGE_REQUEST)
+        self.assertEqual(t.create(), RANGE_REQUEST, "without patch")
+        frame = t.create(
+            invoke_id=0x42,
+            from_value=bytes.fromhex("07 ea 0a 13 ff 00 00 00 00 80 00 00"),
+            to_value=c_pdu.OctetString.from_str("07 ea 0a 14 ff 00 00 00 00 80 00 00"))
+        print(frame.hex(" "))
+        new = c_pdu.XDLMSAPDU.get(Buf.wrap(frame))
+        self.assertEqual(int(new.invoke_id_and_priority), 0x42)
+        self.assertEqual(new.access_selection.access_parameters.value[1].value, bytes.fromhex("07 ea 0a 13 ff 00 00 00 00 80 00 00"))
+        self.assertEqual(new.access_selection.access_parameters.value[2].value, bytes.fromhex("07 ea 0a 14 ff 00 00 00 00 80 00 00"))
+        self.assertEqual(frame[:2] + frame[3:36], RANGE_REQUEST[:2] + RANGE_REQUEST[3:36], "other bytes not changed")
+        t2 = t.replace(invoke_id=c_pdu.InvokeIdAndPriority.from_int(0x43))
+        self.assertEqual(t2.create()[2], 0x43)
+        self.assertEqual(t.frame, RANGE_REQUEST, "source template not changed")
+
+    def test_error(self):
+        value, request = range_request()
+        with self.assertRaises(ValueError):
+            Template(value, invoke_id=c_pdu.InvokeIdAndPriority.from_int(1))
+        t = Template(value, invoke_id=request.invoke_id_and_priority)
+        with self.assertRaises(ValueError):
+            t.create(invoke_id=c_pdu.Unsigned16.from_int(1))
+        with self.assertRaises(OverflowError):
+            t.create(invoke_id=256)
+        _, from_value, _, _ = request.access_selection.access_parameters.value
+        t = Template(value, from_value=from_value)
+        for date in (bytes.fromhex("07 eb 01"), bytes(13)):
+            with self.assertRaises(ValueError):
+                t.create(from_value=date)
+        with self.assertRaises(ValueError):
+            Template(value, invoke_id=(5,))
+
+    def test_path(self):
+        data = c_pdu.Data.get(Buf.wrap(bytes.fromhex("02 02 11 05 11 05")))
+        self.assertIs(data.value[0], data.value[1], "interned")
+        with self.assertRaises(ValueError):
+            Template(data, second=data.value[1])
+        t = Template(data, second=(1,))
+        self.assertEqual(t.create(second=9), bytes.fromhex("02 02 11 05 11 09"))
+        value, request = range_request()
+        t = Template(value, invoke_id=("invoke_id_and_priority",), to_value=("access_selection", "access_parameters", 2))
+        self.assertEqual(t.fields["invoke_id"].start, 2)
+        frame = t.create(invoke_id=0x42, to_value=bytes.fromhex("07 ea 0a 14 ff 00 00 00 00 80 00 00"))
+        new = c_pdu.XDLMSAPDU.get(Buf.wrap(frame))
+        self.assertEqual(int(new.invoke_id_and_priority), 0x42)
+        self.assertEqual(new.access_selection.access_parameters.value[2].value, bytes.fromhex("07 ea 0a 14 ff 00 00 00 00 80 00 00"))
@@ -0,0 +1,68 @@
+import unittest
+from src.COSEMpdu import main as c_pdu, vector
+from src.COSEMpdu.byte_buffer import ByteBuffer as Buf
+from test_compiler import profile_response
+
+
+class TestType(unittest.TestCase):
+    def test_DTYPES(self):
+        self.assertEqual(vector.DTYPES[c_pdu.DoubleLongUnsigned.Tag.ClassNumber], ">u4")
+        self.assertEqual(vector.DTYPES[c_pdu.Float32.Tag.ClassNumber], ">f4")
+        self.assertEqual(vector.DTYPES[c_pdu.Long.Tag.ClassNumber], ">i2")
+        self.assertIsNone(vector.DTYPES[c_pdu.OctetString.Tag.ClassNumber])
+        self.assertIsNone(vector.DTYPES[c_pdu.DateTime.Tag.ClassNumber])
+
+    @unittest.skipIf(vector.np is None, "numpy not installed")
+    def test_get_array(self):
+        buf = Buf.wrap(bytes.fromhex("01 03 06 00 00 00 01 06 00 00 01 00 06 ff ff ff ff 11"))
+        value = vector.get_array(buf)
+        self.assertEqual(value.tolist(), [1, 256, 0xffffffff])
+        self.assertEqual(buf.get_pos(), 17)
+        buf = Buf.wrap(bytes.fromhex("01 02 10 ff fe 10 00 02"))
+        self.assertEqual(vector.get_array(buf).tolist(), [-2, 2])
+        for data in ("01 02 06 00 00 00 01 05 00 00 00 01", "01 00", "01 01 09 01 00", "02 01 11 00"):
+            buf = Buf.wrap(bytes.fromhex(data))
+            self.assertIsNone(vector.get_array(buf), data)
+            self.assertEqual(buf.get_pos(), 0)
+        with self.assertRaises(BufferError):
+            vector.get_array(Buf.wrap(bytes.fromhex("01 02 06 00 00 00 01 06 00")))
+
+    @unittest.skipIf(vector.np is None, "numpy not installed")
+    def test_get_table(self):
+        buf = Buf.wrap(profile_response(3))
+        buf.read(4)
+        table = vector.get_table(buf, ("clock", "a", "b", "c", "d", "status"))
+        self.assertEqual(buf.remaining(), 0)
+        print(table.dtype, table)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table["d"].tolist(), [4, 4, 4])
+        self.assertEqual(bytes(table["clock"][2]), bytes.fromhex("07 e8 01 01 01 00 00 00 00 80 00 00"))
+        self.assertEqual(table["status"][1], 7)
+        columns = vector.get_columns(Buf(memoryview(profile_response(2))[4:]))
+        self.assertEqual(list(columns), ["f0", "f1", "f2", "f3", "f4", "f5"])
+        with self.assertRaises(ValueError):
+            vector.get_table(Buf(memoryview(profile_response(2))[4:]), ("a",))
+        nested = bytes.fromhex("01 02 02 02 02 02 0f fe 16 1e 12 00 01 02 02 02 02 0f fd 16 1b 12 00 02")
+        table = vector.get_table(Buf.wrap(nested))
+        self.assertEqual(table.tolist(), [(-2, 30, 1), (-3, 27, 2)])
+        for data in ("01 02 02 01 11 01 02 01 12 00 01",
+                     "01 02 02 01 11 01 02 02 11 01 11 02",
+                     "01 02 02 01 09 01 01 02 01 09 02 01 02",
+                     "01 02 02 01 11 01",
+                     "01 01 11 01"):
+            buf = Buf.wrap(bytes.fromhex(data))
+            self.assertIsNone(vector.get_table(buf), data)
+            self.assertEqual(buf.get_pos(), 0)
+
+    @unittest.skipIf(vector.np is None, "numpy not installed")
+    def test_get_compact_table(self):
+        value = c_pdu.CompactArray.from_columns((c_pdu.DoubleLongUnsigned, c_pdu.Long, c_pdu.DateTime),
+                                                ([1, 2, 3], [-1, 0, 1], [bytes(12)] * 3))
+        table = vector.get_compact_table(value, ("a", "b", "clock"))
+        self.assertEqual(table["a"].tolist(), [1, 2, 3])
+        self.assertEqual(table["b"].tolist(), [-1, 0, 1])
+        self.assertEqual(table["clock"].shape, (3, 12))
+        value = c_pdu.CompactArray.from_columns((c_pdu.LongUnsigned,), ([7, 8, 9],))
+        self.assertEqual(vector.get_compact_table(value).tolist(), [7, 8, 9])
+        value = c_pdu.CompactArray.from_columns((c_pdu.Long, c_pdu.OctetString), ([1], [b'a']))
+        self.assertIsNone(vector.get_compact_table(value))